@@ -4,11 +4,23 @@ import json
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.optimize import minimize
+import contextlib
+import contextvars
+import functools
+import hashlib
 import logging
-
+import math
+import multiprocessing
+import threading
+import time
+
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 
+from algorithm.solution_store import SolutionStore
+
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
@@ -182,14 +194,118 @@ p_c_max = 0.9
 p_m_min = 0.01
 p_m_max = 0.2
 w_max = 7 
+FITNESS_CACHE_SIZE = 50000                                              # max. partitions kept in the fitness cache of parallel evaluation, 0 disables it
+MAKESPAN_CACHE_SIZE = 100000                                            # max. (durations, repairmen) entries kept in the makespan cache
+FITNESS_WORKERS = int(os.getenv("GA_FITNESS_WORKERS", "1"))             # processes used to evaluate fitness, 1 evaluates in-process
+ISLANDS = 4                                                             # sub-populations of the island model
+MIGRATION_INTERVAL = 25                                                 # generations between two migrations
+ISLAND_SIGNAL_INTERVAL = 0.05                                           # seconds between two checks of the cancel and stop events for the islands
+MIGRANTS = 2                                                            # best genomes sent to the next island at each migration
+PARALLEL_MIN_CHUNK = 8                                                  # min. genomes per worker before a batch is sent to the pool
+SOLUTION_STORE_PATH = os.getenv("GA_SOLUTION_STORE", "")              # SQLite file of the per-module solution store, empty disables it
+WARM_START_FRACTION = 0.2                                               # share of the initial population seeded from a stored schedule
+DP_MAX_GROUP_SIZE = 64                                                  # largest group considered by the contiguous partition solver
+EXACT_MAX_ACTIVITIES = 12                                               # requests with at most this many activities are solved exactly
+LOCAL_SEARCH_INTERVAL = 25                                              # generations between two local searches on the elites
+LOCAL_SEARCH_ELITES = 2                                                 # best genomes refined by each periodic local search
+LOCAL_SEARCH_EVALUATIONS = 1000                                         # max. neighbours evaluated by a periodic local search
+LOCAL_SEARCH_FINAL_EVALUATIONS = 20000                                  # max. neighbours evaluated when refining the final best
+LOCAL_SEARCH_BATCH = 32                                                 # neighbours evaluated together
+
+class StageProfiler:
+    """
+    Wall-clock time spent in each stage of a run (decode, mapping, makespan, penalty, evaluation, selection,
+    crossover, mutation, local search), collected by the functions decorated with profiled(). decode is the
+    splitting of genomes into groups and mapping the lookup of the per-activity values of those groups.
 
-# initialize genome
-def random_genome(length):
-    return [random.randint(1, length) for _ in range(length)]
-    
-# initialize population
-def init_population(population_size, genome_length):
-    return [random_genome(genome_length) for _ in range(population_size)]
+    Stages can be nested (evaluation includes decode, mapping, makespan and penalty), so their times are inclusive.
+    """
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, stage, seconds):
+        self.samples[stage].append(seconds)
+
+    def merge(self, samples):
+        # add the samples of another profiler, e.g. of an island run in a worker process
+        for stage, values in samples.items():
+            self.samples[stage].extend(values)
+
+    def stats(self):
+        return {
+            stage: {
+                "calls": len(values),
+                "total time": round(math.fsum(values), 6),
+                "p50": round(float(np.percentile(values, 50)), 6),
+                "p99": round(float(np.percentile(values, 99)), 6)
+            }
+            for stage, values in sorted(self.samples.items(), key=lambda item: -math.fsum(item[1]))
+        }
+
+
+class RunCounters:
+    """
+    Totals of the GA work done by this process (generations and evaluated genomes), for the API metrics.
+
+    Island workers count in their own process; the island coordinator adds their totals after every epoch.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.generations = 0
+        self.evaluations = 0
+
+    def add(self, generations=0, evaluations=0):
+        with self._lock:
+            self.generations += generations
+            self.evaluations += evaluations
+
+
+run_counters = RunCounters()
+
+
+# profiler of the run in progress in the current thread, None when profiling is disabled
+_profiler = contextvars.ContextVar("profiler", default=None)
+
+
+# profile the stages run by the current thread with profiler until the block exits
+@contextlib.contextmanager
+def profiling(profiler):
+    token = _profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _profiler.reset(token)
+
+
+# decorator recording the duration of every call of a function as stage; without a profiler only the lookup is added
+def profiled(stage):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.record(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+# smallest signed integer type holding the group labels of a genome
+def genome_dtype(genome_length):
+    return np.int16 if genome_length < np.iinfo(np.int16).max else np.int32
+
+# random generator of a GA run, seeded from the random module so random.seed() keeps runs reproducible
+def make_rng(seed=None):
+    return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+
+# initialize population: one genome per row of a small-integer array
+def init_population(population_size, genome_length, rng=None):
+    rng = rng if rng is not None else make_rng()
+    return rng.integers(1, genome_length, size=(population_size, genome_length), endpoint=True, dtype=genome_dtype(genome_length))
 
 # evaluation
 def decode(genome):
@@ -241,74 +357,19 @@ def mapping_activity_to_componentID(map_activity_to_IDcomponent, G_activity):
     return group_to_components
 
 
-# mapping group of activity to group of replacement time using list of tuple map_activity_to_replacement_time defined above
-def mapping_activity_to_replacement_time(map_activity_to_replacement_time, G_activity):
-    # Create a dictionary to map each activity to its replacement time t
-    dict_map = {activity: t for activity, t in map_activity_to_replacement_time}
-
-    # Initialize the result list
-    group_to_replacement_time = []
-
-    # Process each group and its activities
-    for group, activities in G_activity:
-        # Find the time list for each activity in the current group
-        time_list = [dict_map[activity] for activity in activities if activity in dict_map]
-        # Append the result as a tuple (group, time list)
-        group_to_replacement_time.append((group, time_list))
-    return group_to_replacement_time
+# mapping group of activity to group of per-activity values (duration, alpha, beta) stored in the problem context
+def mapping_activity_to_value(values, G_activity):
+    return [(group, values[np.asarray(activities) - 1].tolist()) for group, activities in G_activity]
 
 
-# mapping group of component to group of duration using output from mapping_activity_to_componentID()
+# mapping group of activity to group of duration using the problem context
 # and calculate total duration of each group
-def mapping_IDcomponent_to_duration(G_component, component_list):
-    group_to_duration = []
-    total_duration = []
-    for group, id_component in G_component:
-        duration = []
-        for d in id_component:
-            try:
-                value = next(item["Average maintenance duration"] for item in component_list if item["Module ID"] == d)
-                duration.append(value)
-            except StopIteration:
-                logger.error(f"Component with Module ID '{d}' not found in component_list for duration mapping")
-                raise ValueError(f"Component with Module ID '{d}' not found in component list")
-        group_to_duration.append((group, duration))
-        total_duration.append(sum(duration))
+def mapping_activity_to_duration(context, G_activity):
+    group_to_duration = mapping_activity_to_value(context.duration, G_activity)
+    total_duration = [sum(duration) for _, duration in group_to_duration]
     return group_to_duration, total_duration                            # total_duration: sum_di
 
 
-# mapping group of component to group of alpha using output from mapping_activity_to_componentID()
-def mapping_IDcomponent_to_alpha(G_component, component_list):
-    group_to_alpha = []
-    for group, id_component in G_component:
-        alpha = []
-        for d in id_component:
-            try:
-                value = next(item["Alpha"] for item in component_list if item["Module ID"] == d)
-                alpha.append(value)
-            except StopIteration:
-                logger.error(f"Component with Module ID '{d}' not found in component_list for alpha mapping")
-                raise ValueError(f"Component with Module ID '{d}' not found in component list")
-        group_to_alpha.append((group, alpha))
-    return group_to_alpha
-
-
-# mapping group of component to group of beta using output from mapping_activity_to_componentID()
-def mapping_IDcomponent_to_beta(G_component, component_list):
-    group_to_beta = []
-    for group, id_component in G_component:
-        beta = []
-        for d in id_component:
-            try:
-                value = next(item["Beta"] for item in component_list if item["Module ID"] == d)
-                beta.append(value)
-            except StopIteration:
-                logger.error(f"Component with Module ID '{d}' not found in component_list for beta mapping")
-                raise ValueError(f"Component with Module ID '{d}' not found in component list")
-        group_to_beta.append((group, beta))
-    return group_to_beta
-
-
 # First Fit Decreasing (FFD) method
 def first_fit_decreasing(durations, m, D):
     durations = sorted(durations, reverse=True)
@@ -340,11 +401,80 @@ def multifit(durations, m, w_max):
     return min_maintenance_duration
 
 def calculate_d_Gk(G_duration, m, w_max):
-    d_Gk = []
-    for _, durations in G_duration:
-        optimal_duration = multifit(durations, m, w_max)
-        optimal_duration = round(optimal_duration, 3)
-        d_Gk.append(optimal_duration)
+    durations = [d for _, group in G_duration for d in group]
+    group_index = np.repeat(np.arange(len(G_duration)), [len(group) for _, group in G_duration])
+    return calculate_group_makespan(durations, group_index, len(G_duration), m, w_max).tolist()
+
+# multifit for many groups at once: durations is a (groups x longest group) matrix sorted in decreasing order
+# and zero-padded, counts the number of activities of each group. Loads are accumulated in the same order as
+# first_fit_decreasing, so the result is identical to calling multifit on every group.
+def vectorized_multifit(durations, counts, m, w_max):
+    number_of_groups, longest = durations.shape
+    total = np.cumsum(durations, axis=1)[:, -1]
+    D_low = np.maximum(durations[:, 0], total / m)
+    D_up = np.maximum(durations[:, 0], 2 * total / m)
+    min_maintenance_duration = np.full(number_of_groups, np.nan)
+    rows = np.arange(number_of_groups)
+    for w in range(w_max):
+        D = (D_up + D_low) / 2
+        repairmen = np.zeros((number_of_groups, m))
+        feasible = np.ones(number_of_groups, dtype=bool)
+        for j in range(longest):
+            duration = durations[:, j]
+            active = j < counts
+            # Find the first repairman who can take this activity
+            fits = repairmen + duration[:, None] <= D[:, None]
+            assigned = fits.any(axis=1)
+            place = active & assigned & feasible
+            repairmen[rows[place], fits.argmax(axis=1)[place]] += duration[place]
+            feasible &= assigned | ~active
+        D_up = np.where(feasible, D, D_up)
+        D_low = np.where(feasible, D_low, D)
+        min_maintenance_duration = np.where(feasible, repairmen.max(axis=1), min_maintenance_duration)
+    return min_maintenance_duration
+
+# makespan of every group given as flat arrays (duration of each activity and its group index).
+# Single-activity groups and m = 1 are solved directly, other groups are looked up in the makespan cache
+# by (sorted durations, m, w_max) and the remaining ones are solved together with vectorized_multifit.
+@profiled("makespan")
+def calculate_group_makespan(durations, group_index, number_of_groups, m, w_max):
+    durations = np.asarray(durations, dtype=float)
+    group_index = np.asarray(group_index, dtype=int)
+    counts = np.bincount(group_index, minlength=number_of_groups)
+    d_Gk = np.empty(number_of_groups)
+    if number_of_groups == 0:
+        return d_Gk
+
+    # Zero-padded matrix with the durations of each group in decreasing order
+    order = np.lexsort((-durations, group_index))
+    starts = np.cumsum(counts) - counts
+    position = np.arange(len(order)) - starts[group_index[order]]
+    matrix = np.zeros((number_of_groups, counts.max()))
+    matrix[group_index[order], position] = durations[order]
+
+    if m == 1:
+        # One repairman performs the whole group: the makespan is the sum of its durations
+        return np.array([round(d, 3) for d in np.cumsum(matrix, axis=1)[:, -1].tolist()])
+
+    single = counts == 1
+    d_Gk[single] = [round(d, 3) for d in matrix[single, 0].tolist()]
+
+    missing = {}
+    for k in np.flatnonzero(~single).tolist():
+        key = (tuple(matrix[k, :counts[k]].tolist()), m, w_max)
+        value = _makespan_cache.get(key)
+        if value is None:
+            missing.setdefault(key, []).append(k)
+        else:
+            d_Gk[k] = value
+    if missing:
+        groups = [positions[0] for positions in missing.values()]
+        solved = vectorized_multifit(matrix[groups], counts[groups], m, w_max)
+        for (key, positions), value in zip(missing.items(), solved.tolist()):
+            # multifit itself fails when no binary search step was feasible
+            value = round(value, 3) if not np.isnan(value) else round(multifit(list(key[0]), m, w_max), 3)
+            _makespan_cache.put(key, value)
+            d_Gk[positions] = value
     return d_Gk
 
 # setup cost saving
@@ -356,10 +486,8 @@ def saveup_cost_saving(G_activity, C_s):
     return B_S                                                          # shape(B_S) = number of group
 
 # unavailability cost saving
-def unavailability_cost_saving(G_activity, C_d, m, w_max, component_list, TW_start, TW_end):
-    _, map_activity_to_IDcomponent, _, _ = calculate_maintenance_time(component_list, TW_start, TW_end)
-    G_component = mapping_activity_to_componentID(map_activity_to_IDcomponent, G_activity)
-    G_duration, G_total_duration = mapping_IDcomponent_to_duration(G_component, component_list)
+def unavailability_cost_saving(G_activity, C_d, m, w_max, context):
+    G_duration, G_total_duration = mapping_activity_to_duration(context, G_activity)
     d_Gk = calculate_d_Gk(G_duration, m, w_max)
     B_U = (np.array(G_total_duration) - np.array(d_Gk)) * C_d
     return B_U
@@ -379,30 +507,86 @@ def P_Gk(t, t_i_list, alpha_i_list, beta_i_list):
         total_sum += P_i(t, t_i, alpha_i, beta_i)
     return total_sum
 
-# Define the wrapper function for minimization
-def wrapper_P_Gk(t, t_i_list, alpha_i_list, beta_i_list):
-    return P_Gk(t[0], t_i_list, alpha_i_list, beta_i_list)
+# Exact minimiser of P_Gk for many groups at once.
+# P_Gk is a sum of convex piecewise quadratics, so on each segment between two sorted t_i it is a single
+# quadratic A*t^2 - 2*B*t + C whose minimum t = B/A can be written down directly. The group optimum is the
+# best of these segment minima once each is clipped to its own segment.
+@profiled("penalty")
+def solve_group_penalty(t_i, alpha_i, beta_i, group_index, number_of_groups):
+    """
+    Minimise P_Gk(t) for every group in one vectorised pass.
+
+    Args:
+        t_i (array): replacement time of each activity
+        alpha_i (array): penalty weight of each activity when the group is executed early (t <= t_i)
+        beta_i (array): penalty weight of each activity when the group is executed late (t > t_i)
+        group_index (array): group of each activity, in range(number_of_groups); every group must be non-empty
+        number_of_groups (int): number of groups
+
+    Returns:
+        tuple: (P, t_group) arrays with the minimum penalty and the optimal execution time of each group
+    """
+    t_i = np.asarray(t_i, dtype=float)
+    alpha_i = np.asarray(alpha_i, dtype=float)
+    beta_i = np.asarray(beta_i, dtype=float)
+    group_index = np.asarray(group_index, dtype=int)
+
+    # Sort activities by group, then by replacement time, so each group's breakpoints are contiguous
+    order = np.lexsort((t_i, group_index))
+    t_s, a_s, b_s, g_s = t_i[order], alpha_i[order], beta_i[order], group_index[order]
+    counts = np.bincount(g_s, minlength=number_of_groups)
+    starts = np.cumsum(counts) - counts
+
+    def before(x):
+        # Sum of x over the activities that precede each activity within its group
+        excl = np.cumsum(x) - x
+        return excl - excl[starts][g_s]
+
+    def total(x):
+        return np.bincount(g_s, weights=x, minlength=number_of_groups)
+
+    # Segment ending at the j-th breakpoint: earlier activities are late (beta), the rest early (alpha)
+    coefficients = []
+    for w_late, w_early in ((b_s, a_s), (b_s * t_s, a_s * t_s), (b_s * t_s ** 2, a_s * t_s ** 2)):
+        coefficients.append((before(w_late) + total(w_early)[g_s] - before(w_early), total(w_late)))
+    (A_seg, A_end), (B_seg, B_end), (C_seg, C_end) = coefficients
+
+    is_first = np.arange(len(t_s)) == starts[g_s]
+    lower_seg = np.where(is_first, -np.inf, np.roll(t_s, 1))
+    last_t = t_s[starts + counts - 1]
+
+    # Candidate segments: one ending at each breakpoint plus one after the last breakpoint of each group
+    A = np.concatenate((A_seg, A_end))
+    B = np.concatenate((B_seg, B_end))
+    C = np.concatenate((C_seg, C_end))
+    lower = np.concatenate((lower_seg, last_t))
+    upper = np.concatenate((t_s, np.full(number_of_groups, np.inf)))
+    candidate_group = np.concatenate((g_s, np.arange(number_of_groups)))
+
+    t_star = np.divide(B, A, out=np.zeros_like(B), where=A > 0)
+    t_star = np.clip(t_star, lower, upper)
+    value = A * t_star ** 2 - 2 * B * t_star + C
+
+    # Keep the best candidate of each group
+    best = np.lexsort((value, candidate_group))
+    first = np.ones(len(best), dtype=bool)
+    first[1:] = candidate_group[best][1:] != candidate_group[best][:-1]
+    t_group = np.empty(number_of_groups)
+    t_group[candidate_group[best][first]] = t_star[best][first]
+
+    # Evaluate the penalty exactly at the optimum rather than through the expanded quadratic
+    delta_t = t_group[g_s] - t_s
+    P = np.bincount(g_s, weights=np.where(delta_t <= 0, a_s, b_s) * delta_t ** 2, minlength=number_of_groups)
+    return P, t_group
 
 # penalty cost
-def penalty_cost(G_activity, component_list, TW_start, TW_end):
-    _, map_activity_to_IDcomponent, map_activity_to_replacement_time, _ = calculate_maintenance_time(component_list, TW_start, TW_end)
-    G_component = mapping_activity_to_componentID(map_activity_to_IDcomponent, G_activity)
-    G_alpha = mapping_IDcomponent_to_alpha(G_component, component_list)
-    G_beta = mapping_IDcomponent_to_beta(G_component, component_list)
-    replacement_time = mapping_activity_to_replacement_time(map_activity_to_replacement_time, G_activity)
-    P = []                                                                  # penalty cost in each group
-    t_group = []                                                            # optimal time to minimize penalty cost in each group
-    for i in range(len(G_alpha)):
-        group, alpha_i_list = G_alpha[i]
-        _, beta_i_list = G_beta[i]
-        _, t_i_list = replacement_time[i]
-        # Initial guess for t
-        initial_guess = [0.0]
-        # Perform the minimization
-        result = minimize(wrapper_P_Gk, initial_guess, args=(t_i_list, alpha_i_list, beta_i_list))
-        P.append(np.round(result.fun, decimals=3))
-        t_group.append(np.round(result.x, decimals=3))
-    t_group = [float(arr[0]) for arr in t_group]
+def penalty_cost(G_activity, context):
+    activities = np.concatenate([np.asarray(activity) for _, activity in G_activity]) - 1
+    group_index = np.repeat(np.arange(len(G_activity)), [len(activity) for _, activity in G_activity])
+    P, t_group = solve_group_penalty(context.replacement_time[activities], context.alpha[activities],
+                                     context.beta[activities], group_index, len(G_activity))
+    P = list(np.round(P, decimals=3))                                       # penalty cost in each group
+    t_group = np.round(t_group, decimals=3).tolist()                        # optimal time to minimize penalty cost in each group
     return P, t_group
 
 # cost benefit EB = B_S + B_U + P
@@ -411,112 +595,954 @@ def cost_benefit(B_S, B_U, P):
     return EB
 
 # fitness function
-def fitness_function(genome, C_s, C_d, m, component_list, TW_start, TW_end):
+def fitness_function(genome, C_s, C_d, m, context):
     N, G_activity = decode(genome)  
     B_S = saveup_cost_saving(G_activity, C_s)
-    B_U = unavailability_cost_saving(G_activity, C_d, m, w_max, component_list, TW_start, TW_end)
-    P, _ = penalty_cost(G_activity, component_list, TW_start, TW_end)
+    B_U = unavailability_cost_saving(G_activity, C_d, m, w_max, context)
+    P, _ = penalty_cost(G_activity, context)
     EB = cost_benefit(B_S, B_U, P)
     fitness_value = np.sum(EB)
     return fitness_value
 
 
-def linear_ranking_selection(population, fitness_values, num_groups=5):
-    population_size = len(population)
+# batch fitness function over a population matrix (population size x number of activities)
+def population_fitness(population, C_s, C_d, m, context):
+    """
+    Evaluate a whole population in one call with segment reductions over (genome, group) pairs.
+
+    Gives the same values as fitness_function for every row, up to floating point summation order.
+
+    Args:
+        population (array): 2-D integer array, one genome per row
+        C_s (float): setup cost
+        C_d (float): downtime cost rate
+        m (int): number of repairmen
+        context (ProblemContext): per-request activity table
+
+    Returns:
+        np.ndarray: fitness value of each genome
+    """
+    population = np.asarray(population, dtype=np.int64)
+    population_size, genome_length = population.shape
+    if population.size == 0:
+        return np.zeros(population_size)
+
+    activity, group_index, number_of_groups, group_row = segment_population(population)
+    EB = group_cost_benefit(activity, group_index, number_of_groups, C_s, C_d, m, context)
+    return np.bincount(group_row, weights=EB, minlength=population_size)
+
+
+# one segment per distinct (genome, group label) pair of a population matrix, as flat arrays: 0-based activity,
+# group index of the activity, number of groups, and population row of every group
+@profiled("decode")
+def segment_population(population):
+    population_size, genome_length = population.shape
+    rows = np.repeat(np.arange(population_size), genome_length)
+    labels = population.ravel() - population.min()
+    _, group_index = np.unique(rows * (labels.max() + 1) + labels, return_inverse=True)
+    group_index = group_index.ravel()
+    number_of_groups = group_index.max() + 1
+    group_row = np.empty(number_of_groups, dtype=np.int64)
+    group_row[group_index] = rows
+    activity = np.tile(np.arange(genome_length), population_size)
+    return activity, group_index, number_of_groups, group_row
+
+
+# per-activity duration, replacement time, alpha and beta of the flat activity array of many groups
+@profiled("mapping")
+def map_activity_values(activity, context):
+    return context.duration[activity], context.replacement_time[activity], context.alpha[activity], context.beta[activity]
+
+
+# cost benefit EB = B_S + B_U - P of many groups given as flat arrays (0-based activity and its group index)
+def group_cost_benefit(activity, group_index, number_of_groups, C_s, C_d, m, context):
+    durations, replacement_time, alpha, beta = map_activity_values(activity, context)
+    # B_S: setup cost saving
+    group_size = np.bincount(group_index, minlength=number_of_groups)
+    B_S = (group_size - 1) * C_s
+    # B_U: unavailability cost saving
+    total_duration = np.bincount(group_index, weights=durations, minlength=number_of_groups)
+    d_Gk = calculate_group_makespan(durations, group_index, number_of_groups, m, w_max)
+    B_U = (total_duration - d_Gk) * C_d
+    # P: penalty cost
+    P, _ = solve_group_penalty(replacement_time, alpha, beta, group_index, number_of_groups)
+    return B_S + B_U - np.round(P, decimals=3)
+
+
+class IncrementalFitness:
+    """
+    Fitness evaluation that keeps the cost benefit EB of every group of a genome.
+
+    The group costs of a genome are a dict {group label: (activities, EB)}, activities being a sorted array of
+    0-based activity indices. An offspring only differs from its parent at a few positions, and only the groups
+    whose label appears at one of those positions can change: they are recomputed, every other group is reused
+    from the parent. The fitness is the exactly rounded sum of the group costs, so it does not depend on the
+    order in which the groups were built.
+    """
+    def __init__(self, C_s, C_d, m, context):
+        self.C_s, self.C_d, self.m, self.context = C_s, C_d, m, context
+        self.full_evaluations = 0
+        self.delta_evaluations = 0
+        self.groups_evaluated = 0
+
+    def _evaluate_groups(self, groups):
+        # EB of a list of activity arrays, in one batch
+        if not groups:
+            return []
+        activity = np.concatenate(groups)
+        group_index = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+        self.groups_evaluated += len(groups)
+        return group_cost_benefit(activity, group_index, len(groups), self.C_s, self.C_d, self.m, self.context).tolist()
+
+    @staticmethod
+    def fitness(group_costs):
+        return math.fsum(EB for _, EB in group_costs.values())
+
+    @staticmethod
+    @profiled("decode")
+    def _split_groups(genomes):
+        # group labels of every genome, and the activity array of each of their groups
+        labels, groups = [], []
+        for genome in genomes:
+            genome = np.asarray(genome)
+            order = np.argsort(genome, kind="stable")
+            genome_labels, starts = np.unique(genome[order], return_index=True)
+            labels.append(genome_labels.tolist())
+            groups.extend(np.split(order, starts[1:]))
+        return labels, groups
+
+    @staticmethod
+    @profiled("decode")
+    def _changed_groups(children, parents, parent_costs):
+        # for every child, None if it equals its parent, else the parent groups it removes and the labels of its
+        # rebuilt groups, whose activity arrays are returned in order
+        changed_groups, groups = [], []
+        for child, parent, costs in zip(children, parents, parent_costs):
+            child, parent = np.asarray(child), np.asarray(parent)
+            changed = np.flatnonzero(child != parent)
+            if len(changed) == 0:
+                changed_groups.append(None)
+                continue
+            # Activities of the parent groups that lose or gain a member, plus the changed positions, regrouped by child label
+            removed = [label for label in np.union1d(parent[changed], child[changed]).tolist() if label in costs]
+            positions = np.unique(np.concatenate([costs[label][0] for label in removed] + [changed]))
+            positions = positions[np.argsort(child[positions], kind="stable")]
+            labels, starts = np.unique(child[positions], return_index=True)
+            groups.extend(np.split(positions, starts[1:]))
+            changed_groups.append((removed, labels.tolist()))
+        return changed_groups, groups
+
+    @profiled("evaluation")
+    def evaluate(self, genomes):
+        """
+        Group costs of genomes evaluated from scratch.
+
+        Returns:
+            tuple: (fitness values, group costs) lists
+        """
+        labels, groups = self._split_groups(genomes)
+        EB = iter(self._evaluate_groups(groups))
+        groups = iter(groups)
+        group_costs = [{label: (next(groups), next(EB)) for label in genome_labels} for genome_labels in labels]
+        self.full_evaluations += len(genomes)
+        run_counters.add(evaluations=len(genomes))
+        return [self.fitness(costs) for costs in group_costs], group_costs
+
+    @profiled("evaluation")
+    def evaluate_offspring(self, children, parents, parent_costs):
+        """
+        Group costs of children, each derived from the parent at the same position.
+
+        Args:
+            children (list): child genomes
+            parents (list): parent genomes, of the same length as the children
+            parent_costs (list): group costs of the parents
+
+        Returns:
+            tuple: (fitness values, group costs) lists
+        """
+        changed_groups, groups = self._changed_groups(children, parents, parent_costs)
+        EB = iter(self._evaluate_groups(groups))
+        groups = iter(groups)
+
+        group_costs = []
+        for costs, changed in zip(parent_costs, changed_groups):
+            if changed is not None:
+                removed, labels = changed
+                costs = costs.copy()
+                for label in removed:
+                    del costs[label]
+                costs.update((label, (next(groups), next(EB))) for label in labels)
+            group_costs.append(costs)
+        self.delta_evaluations += len(children)
+        run_counters.add(evaluations=len(children))
+        return [self.fitness(costs) for costs in group_costs], group_costs
+
+    def stats(self):
+        return {"full evaluations": self.full_evaluations, "delta evaluations": self.delta_evaluations,
+                "groups evaluated": self.groups_evaluated}
+
+
+# canonical form of a genome: groups relabelled in order of first appearance, as in decode()
+def canonical_partition(genome):
+    group_mapping = {}
+    return tuple(group_mapping.setdefault(group, len(group_mapping) + 1) for group in genome)
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with hit/miss counters. get() returns None for missing keys.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self.hits += 1
+                return self._values[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            if len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def stats(self):
+        return {"size": len(self._values), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class FitnessCache(LRUCache):
+    """
+    Bounded LRU cache of fitness values keyed on the canonical partition of a genome.
+
+    Genomes that only differ by group labels encode the same partition and share one entry.
+    """
+    def __init__(self, maxsize=FITNESS_CACHE_SIZE):
+        super().__init__(maxsize)
+
+
+class ResultCache(LRUCache):
+    """
+    Bounded LRU cache whose entries expire ttl seconds after they were stored.
+
+    Expired entries are dropped when they are looked up and count as misses.
+    """
+    def __init__(self, maxsize, ttl):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key):
+        entry = super().get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if time.time() >= expires:
+            with self._lock:
+                self._values.pop(key, None)
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return value
+
+    def put(self, key, value):
+        super().put(key, (value, time.time() + self.ttl))
+
+    def stats(self):
+        return dict(super().stats(), ttl=self.ttl)
+
+
+# Makespan of a group only depends on its durations and the number of repairmen, so it is shared by all requests
+_makespan_cache = LRUCache(MAKESPAN_CACHE_SIZE)
+
+
+# Per-process copy of the request data, set once by the pool initializer
+_worker_problem = None
+
+
+def _init_fitness_worker(C_s, C_d, m, context):
+    global _worker_problem
+    _worker_problem = (C_s, C_d, m, context)
+
+
+def _evaluate_chunk(population):
+    C_s, C_d, m, context = _worker_problem
+    return population_fitness(population, C_s, C_d, m, context)
+
+
+class ParallelFitnessEvaluator:
+    """
+    Evaluate population matrices on a pool of worker processes.
+
+    The request data (costs, repairmen and problem context) is shipped to every worker once when the
+    pool starts; each call then only sends the genomes. Chunks are returned in order, so results do
+    not depend on the number of workers.
+    """
+    def __init__(self, C_s, C_d, m, context, workers):
+        self.C_s, self.C_d, self.m, self.context = C_s, C_d, m, context
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_fitness_worker, initargs=(C_s, C_d, m, context))
+
+    def __call__(self, population):
+        # Small batches are cheaper to evaluate locally than to send to the pool
+        chunks = min(self.workers, len(population) // PARALLEL_MIN_CHUNK)
+        if chunks < 2:
+            return population_fitness(population, self.C_s, self.C_d, self.m, self.context)
+        return np.concatenate(list(self.pool.map(_evaluate_chunk, np.array_split(population, chunks))))
+
+    def close(self):
+        self.pool.shutdown()
+
+
+# fitness of a list of genomes: cached partitions are reused, the others are evaluated in one batch
+def cached_population_fitness(cache, genomes, C_s, C_d, m, context, evaluator=None):
+    keys = [canonical_partition(genome) for genome in genomes]
+    fitness_values = [cache.get(key) for key in keys]
+    missing = {}
+    for key, fitness_value in zip(keys, fitness_values):
+        if fitness_value is None:
+            missing.setdefault(key, len(missing))
+    if missing:
+        matrix = np.array(list(missing))
+        batch = evaluator(matrix) if evaluator is not None else population_fitness(matrix, C_s, C_d, m, context)
+        for key, position in missing.items():
+            cache.put(key, batch[position])
+        fitness_values = [batch[missing[key]] if fitness_value is None else fitness_value
+                          for key, fitness_value in zip(keys, fitness_values)]
+    return fitness_values
+
+
+def linear_ranking_selection(population, fitness_values, num_groups=5, *, rng=None):
+    return population[linear_ranking_selection_indices(fitness_values, rng, num_groups)]
+
+
+# same selection as linear_ranking_selection, returning population indices so fitness values can be carried along
+@profiled("selection")
+def linear_ranking_selection_indices(fitness_values, rng=None, num_groups=5):
+    rng = rng if rng is not None else make_rng()
+    population_size = len(fitness_values)
     # Sort the population based on fitness
-    sorted_population = [x for _, x in sorted(zip(fitness_values, population))]
+    sorted_population = np.argsort(fitness_values, kind="stable")
     # Determine the size of each group
     group_size = population_size // num_groups
     # Assign selection probabilities to each group
     group_probabilities = [0.05, 0.10, 0.15, 0.25, 0.45]
     # Ensure that the sum of group probabilities is 1
     assert sum(group_probabilities) == 1, "Group probabilities must sum to 1"
-    # Initialize list for selected individuals
-    selected = []
-    for _ in range(population_size):
-        # Select a group based on the group probabilities
-        group_index = random.choices(range(num_groups), weights=group_probabilities, k=1)[0]
-        # Determine the start and end indices of the group in the sorted population
-        start_index = group_index * group_size
-        end_index = start_index + group_size
-        # Handle the case where the last group may have fewer members due to integer division
-        if group_index == num_groups - 1:
-            end_index = population_size
-        # Select a random individual from the chosen group
-        selected_individual = random.choice(sorted_population[start_index:end_index])
-        selected.append(selected_individual)
-    return selected
-
-
-def crossover(parent1, parent2, p_c):
-    if random.random() < p_c and len(parent1) >= 3:  # Need at least 3 elements for two-point crossover
-        point1 = random.randint(1, len(parent1) - 2)
-        point2 = random.randint(point1, len(parent1) - 1)
-        child1 = parent1[:point1] + parent2[point1:point2] + parent1[point2:]
-        child2 = parent2[:point1] + parent1[point1:point2] + parent2[point2:]
-        return child1, child2
+    # Select a group for every individual, then a random individual of the group
+    group_index = rng.choice(num_groups, size=population_size, p=group_probabilities)
+    start_index = group_index * group_size
+    # The last group may have more members due to integer division
+    length = np.where(group_index == num_groups - 1, population_size - start_index, group_size)
+    return sorted_population[start_index + (rng.random(population_size) * length).astype(int)]
+
+
+# two-point crossover of every pair (parents1[k], parents2[k]) with probability p_c[k], in place:
+# the segment [point1, point2) is exchanged between the two rows. Returns the mask of crossed pairs.
+@profiled("crossover")
+def crossover(parents1, parents2, p_c, rng):
+    pairs, genome_length = parents1.shape
+    if genome_length < 3:  # Need at least 3 elements for two-point crossover
+        return np.zeros(pairs, dtype=bool)
+    crossed = rng.random(pairs) < p_c
+    point1 = rng.integers(1, genome_length - 2, size=pairs, endpoint=True)
+    point2 = rng.integers(point1, genome_length - 1, endpoint=True)
+    positions = np.arange(genome_length)
+    segment = (positions >= point1[:, None]) & (positions < point2[:, None]) & crossed[:, None]
+    exchanged = parents1[segment]
+    parents1[segment] = parents2[segment]
+    parents2[segment] = exchanged
+    return crossed
+
+
+# swap mutation of every row with probability p_m[k], in place. Returns the rows whose genome changed.
+@profiled("mutation")
+def mutate(population, p_m, rng):
+    population_size, genome_length = population.shape
+    if genome_length < 2:  # Need at least 2 elements to swap
+        return np.zeros(0, dtype=int)
+    mutated = rng.random(population_size) < p_m
+    i = rng.integers(0, genome_length, size=population_size)
+    j = rng.integers(0, genome_length - 1, size=population_size)
+    j += j >= i
+    rows = np.flatnonzero(mutated & (population[np.arange(population_size), i] != population[np.arange(population_size), j]))
+    i, j = i[rows], j[rows]
+    population[rows, i], population[rows, j] = population[rows, j], population[rows, i]
+    return rows
+
+# neighbourhood of a genome for the local search, over groups sorted by mean replacement time:
+# move one activity to the previous or next group, swap two activities of consecutive groups, merge consecutive groups
+def neighbourhood_moves(group_costs, context):
+    labels = sorted(group_costs, key=lambda label: context.replacement_time[group_costs[label][0]].mean())
+    moves = []
+    for previous, label in zip(labels, labels[1:]):
+        members, previous_members = group_costs[label][0].tolist(), group_costs[previous][0].tolist()
+        moves.extend(("move", a, previous) for a in members)
+        moves.extend(("move", a, label) for a in previous_members)
+        moves.extend(("swap", a, b) for a in previous_members for b in members)
+        moves.append(("merge", label, previous))
+    return moves
+
+
+def apply_move(genome, group_costs, move):
+    kind, x, y = move
+    genome = np.array(genome)
+    if kind == "move":
+        genome[x] = y
+    elif kind == "swap":
+        genome[[x, y]] = genome[[y, x]]
     else:
-        return parent1, parent2
-
-def mutate(genome, p_m):
-    if random.random() < p_m and len(genome) >= 2:  # Need at least 2 elements to swap
-        i, j = random.sample(range(len(genome)), 2)
-        genome[i], genome[j] = genome[j], genome[i]
+        genome[group_costs[x][0]] = y
     return genome
 
-def genetic_algorithm(C_s, C_d, m, component_list, TW_start, TW_end, population_size=POPULATION_SIZE, generations=GENERATIONS, p_c_min=p_c_min, p_c_max=p_c_max, p_m_min=p_m_min, p_m_max=p_m_max):
+
+@profiled("local search")
+def hill_climbing(genome, group_costs, incremental, rng, max_evaluations=LOCAL_SEARCH_EVALUATIONS, stopping=None):
+    """
+    First-improvement hill climbing over the move, swap and merge neighbourhoods.
+
+    Neighbours are visited in random order and delta-evaluated LOCAL_SEARCH_BATCH at a time from the current
+    genome's group costs; the first improving one is taken and the scan restarts from it.
+
+    Args:
+        genome (list): starting genome
+        group_costs (dict): group costs of genome, as built by IncrementalFitness
+        incremental (IncrementalFitness): evaluator of the request
+        rng (np.random.Generator): random generator of the run
+        max_evaluations (int): budget of evaluated neighbours
+        stopping (StoppingCriteria): optional stopping rules of the run; the search ends as soon as it is
+            interrupted (deadline passed, cancelled or stopped), keeping the best genome found so far
+
+    Returns:
+        tuple: (genome, fitness value, group costs, number of improving moves)
+    """
+    fitness = incremental.fitness(group_costs)
+    evaluations = improvements = 0
+    improved = True
+    while improved and evaluations < max_evaluations:
+        improved = False
+        moves = neighbourhood_moves(group_costs, incremental.context)
+        moves = [moves[k] for k in rng.permutation(len(moves))]
+        for start in range(0, len(moves), LOCAL_SEARCH_BATCH):
+            if stopping is not None and stopping.interrupted():
+                return genome, fitness, group_costs, improvements
+            batch = moves[start:start + min(LOCAL_SEARCH_BATCH, max_evaluations - evaluations)]
+            neighbours = [apply_move(genome, group_costs, move) for move in batch]
+            values, costs = incremental.evaluate_offspring(neighbours, [genome] * len(batch), [group_costs] * len(batch))
+            evaluations += len(batch)
+            better = [k for k, value in enumerate(values) if value > fitness + 1e-9 * max(1.0, abs(fitness))]
+            if better:
+                k = better[0]
+                genome, fitness, group_costs = neighbours[k], values[k], costs[k]
+                improvements += 1
+                improved = True
+                break
+            if evaluations >= max_evaluations:
+                break
+    return genome, fitness, group_costs, improvements
+
+
+# hill climbing of the final best solution, with a larger budget than the periodic local searches. It is skipped
+# for cancelled or stopped runs, and ends with the remaining time when stopping has a deadline.
+def refine_best(best_solution, best_fitness_value, incremental, rng, stopping=None):
+    if stopping is not None and stopping.reason in ("cancelled", "stopped"):
+        return best_solution, best_fitness_value
+    _, (group_costs,) = incremental.evaluate([best_solution])
+    genome, fitness, _, improvements = hill_climbing(best_solution, group_costs, incremental, rng, LOCAL_SEARCH_FINAL_EVALUATIONS, stopping)
+    logger.info(f"Local search on the best solution: {improvements} improving moves, fitness {best_fitness_value} -> {fitness}")
+    if fitness > best_fitness_value:
+        return list(canonical_partition(genome)), fitness
+    return best_solution, best_fitness_value
+
+
+# fitness of the genomes of population whose value is still NaN, evaluated in one batch
+@profiled("evaluation")
+def evaluate_pending(population, fitness_values, C_s, C_d, m, context, cache, evaluator=None):
+    pending = np.flatnonzero(np.isnan(fitness_values))
+    if len(pending):
+        run_counters.add(evaluations=len(pending))
+        fitness_values[pending] = cached_population_fitness(cache, population[pending].tolist(), C_s, C_d, m, context, evaluator)
+    return fitness_values
+
+
+# share of distinct fitness values in the population, 1.0 for a fully diverse population and close to 0 once it has
+# converged; None when no fitness values are given.
+def population_diversity(fitness_values):
+    if fitness_values is None or len(fitness_values) == 0:
+        return None
+    return round(len(np.unique(fitness_values)) / len(fitness_values), 3)
+
+
+class StoppingCriteria:
+    """
+    Stopping rules of a GA run, checked once per generation after the best solution is updated.
+
+    Any rule left as None is disabled. The first rule that trips is stored in reason
+    ("cancelled", "stopped", "target_fitness", "time_limit", "stagnation" or "max_generations").
+
+    Args:
+        max_generations (int): maximum number of generations
+        time_limit (float): wall-clock budget in seconds, counted from start()
+        stagnation_generations (int): stop when the best fitness did not improve for this many generations
+        target_fitness (float): stop as soon as the best fitness reaches this value
+        deadline (float): absolute time.time() deadline, used instead of time_limit when given
+        progress (callable): optional progress(dict), called on every check with the "generations", "maxGenerations",
+            "bestFitness", "diversity" (share of distinct fitness values in the population) and "elapsedTime"
+        cancel (threading.Event): stop as soon as this event is set, e.g. when the request was superseded
+        stop (threading.Event): stop as soon as this event is set, to accept the best solution found so far
+    """
+    def __init__(self, max_generations=None, time_limit=None, stagnation_generations=None, target_fitness=None, deadline=None, progress=None, cancel=None, stop=None):
+        self.max_generations = max_generations
+        self.time_limit = time_limit
+        self.stagnation_generations = stagnation_generations
+        self.target_fitness = target_fitness
+        self.deadline = deadline
+        self.progress = progress
+        self.cancel = cancel
+        self.stop = stop
+        self.reason = None
+        self.generations = 0
+        self.started = None
+        self._best_fitness = -float('inf')
+        self._last_improvement = 0
+
+    def start(self):
+        self.started = time.time()
+        if self.deadline is None and self.time_limit is not None:
+            self.deadline = self.started + self.time_limit
+        return self
+
+    def check(self, generation, best_fitness, fitness_values=None):
+        self.generations = generation + 1
+        if best_fitness > self._best_fitness:
+            self._best_fitness = best_fitness
+            self._last_improvement = generation
+        if self.progress is not None:
+            self.progress({
+                "generations": self.generations,
+                "maxGenerations": self.max_generations,
+                "bestFitness": float(self._best_fitness),
+                "diversity": population_diversity(fitness_values),
+                "elapsedTime": round(time.time() - self.started, 3) if self.started is not None else None
+            })
+        if self.cancel is not None and self.cancel.is_set():
+            self.reason = "cancelled"
+        elif self.stop is not None and self.stop.is_set():
+            self.reason = "stopped"
+        elif self.target_fitness is not None and best_fitness >= self.target_fitness:
+            self.reason = "target_fitness"
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.reason = "time_limit"
+        elif self.stagnation_generations is not None and generation - self._last_improvement >= self.stagnation_generations:
+            self.reason = "stagnation"
+        elif self.max_generations is not None and self.generations >= self.max_generations:
+            self.reason = "max_generations"
+        return self.reason
+
+    def interrupted(self):
+        """
+        Whether work done between two checks, such as the local search, must end right away: the run was
+        cancelled or stopped, or its deadline has passed. The reason is only set by check().
+        """
+        return ((self.cancel is not None and self.cancel.is_set()) or (self.stop is not None and self.stop.is_set())
+                or (self.deadline is not None and time.time() >= self.deadline))
+
+    def summary(self):
+        return {
+            "Stopping reason": self.reason,
+            "Generations": self.generations,
+            "Elapsed time": round(time.time() - self.started, 3) if self.started is not None else None
+        }
+
+
+# run a number of GA generations on a population, returning the evolved population, the best solution found
+# and the number of generations run, which is lower than generations when the stopping criteria trip.
+# population is a (population size x genome length) integer array and fitness_values a float array where
+# NaN marks genomes that still have to be evaluated; all random draws come from rng.
+def evolve_population(population, fitness_values, generations, C_s, C_d, m, context, cache, evaluator=None, p_c_min=p_c_min, p_c_max=p_c_max, p_m_min=p_m_min, p_m_max=p_m_max, best_solution=None, best_fitness_value=-float('inf'), label="Generation", stopping=None, first_generation=0, incremental=None, local_search_interval=None, rng=None, local_search_fitness=None):
+    rng = rng if rng is not None else make_rng()
+    population = np.asarray(population)
+    fitness_values = np.asarray(fitness_values, dtype=float)
+    # With an IncrementalFitness, group costs are carried along the population and offspring are delta-evaluated
+    # from their parents; genomes without group costs (initial population, migrants) are evaluated from scratch.
+    # The elites are refined by hill climbing every local_search_interval generations, with incremental or, when
+    # the population is evaluated by evaluator, with local_search_fitness from the elites' group costs.
+    local_search_fitness = incremental or local_search_fitness
+    group_costs = [None] * len(population)
+    for generation in range(first_generation, first_generation + generations):
+        run_counters.add(generations=1)
+        if incremental is not None:
+            missing = [i for i, costs in enumerate(group_costs) if costs is None]
+            if missing:
+                values, costs = incremental.evaluate(population[missing])
+                fitness_values[missing] = values
+                for i, costs in zip(missing, costs):
+                    group_costs[i] = costs
+        else:
+            fitness_values = evaluate_pending(population, fitness_values, C_s, C_d, m, context, cache, evaluator)
+        if local_search_fitness is not None and local_search_interval and (generation + 1) % local_search_interval == 0:
+            # Memetic step: refine the elites in place
+            for i in np.argsort(-fitness_values, kind="stable")[:LOCAL_SEARCH_ELITES].tolist():
+                costs = group_costs[i]
+                if costs is None:
+                    _, (costs,) = local_search_fitness.evaluate([population[i]])
+                population[i], fitness_values[i], costs, _ = hill_climbing(population[i], costs, local_search_fitness, rng, stopping=stopping)
+                if incremental is not None:
+                    group_costs[i] = costs
+        ranking = np.argsort(-fitness_values, kind="stable")
+        # Update best solution
+        current_best_fitness = fitness_values[ranking[0]]
+
+        if current_best_fitness >= best_fitness_value:
+            best_fitness_value = current_best_fitness
+            best_solution = population[ranking[0]].tolist()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{label} {generation} | Best fitness = {best_fitness_value} | Best genome: {best_solution}")
+
+        if stopping is not None and stopping.check(generation, best_fitness_value, fitness_values):
+            return population, fitness_values, best_solution, best_fitness_value, generation + 1 - first_generation
+
+        f_avg = np.mean(fitness_values)
+        f_max = np.max(fitness_values)
+        spread = f_max - f_avg if f_max > f_avg else 1.0
+
+        # Elitism, then linear ranking selection: rows 2, 3 / 4, 5 / ... of the new population are the crossover pairs
+        selected = linear_ranking_selection_indices(fitness_values, rng)
+        selected[:2] = ranking[:2]
+        parents = population[selected]
+        new_population = parents.copy()
+        new_fitness_values = fitness_values[selected]
+        new_group_costs = [group_costs[i] for i in selected.tolist()]
+
+        # Crossover, in place on the pairs
+        f_c = np.maximum(new_fitness_values[2::2], new_fitness_values[3::2])
+        p_c = np.where(f_c > f_avg, p_c_max - (p_c_max - p_c_min) * (f_c - f_avg) / spread, p_c_max)
+        crossed = 2 + 2 * np.flatnonzero(crossover(new_population[2::2], new_population[3::2], p_c, rng))
+        # Only children produced by an actual crossover need a new evaluation
+        crossed = np.sort(np.concatenate((crossed, crossed + 1)))
+        new_fitness_values[crossed] = np.nan
+        if incremental is not None:
+            # Each child is derived from the parent at the same position of the pair
+            values, costs = incremental.evaluate_offspring(new_population[crossed], parents[crossed],
+                                                           [new_group_costs[i] for i in crossed.tolist()])
+            new_fitness_values[crossed] = values
+            for i, costs in zip(crossed.tolist(), costs):
+                new_group_costs[i] = costs
+        else:
+            new_fitness_values = evaluate_pending(new_population, new_fitness_values, C_s, C_d, m, context, cache, evaluator)
+
+        # Mutation, in place on every row but the elites
+        f_m = new_fitness_values[2:]
+        p_m = np.where(f_m > f_avg, p_m_max - (p_m_max - p_m_min) * (f_max - f_m) / spread, p_m_max)
+        before = new_population[2:].copy() if incremental is not None else None
+        mutated = 2 + mutate(new_population[2:], p_m, rng)
+        # Mutated genomes are evaluated at the start of the next generation, or right away by delta
+        new_fitness_values[mutated] = np.nan
+        if incremental is not None and len(mutated):
+            values, costs = incremental.evaluate_offspring(new_population[mutated], before[mutated - 2],
+                                                           [new_group_costs[i] for i in mutated.tolist()])
+            new_fitness_values[mutated] = values
+            for i, costs in zip(mutated.tolist(), costs):
+                new_group_costs[i] = costs
+
+        population = new_population
+        fitness_values = new_fitness_values
+        group_costs = new_group_costs
+
+    return population, fitness_values, best_solution, best_fitness_value, generations
+
+
+def genetic_algorithm(C_s, C_d, m, component_list, TW_start, TW_end, population_size=POPULATION_SIZE, generations=GENERATIONS, p_c_min=p_c_min, p_c_max=p_c_max, p_m_min=p_m_min, p_m_max=p_m_max, context=None, workers=FITNESS_WORKERS, stopping=None, warm_start=None, local_search=False):
     component_load(component_list)
-    ID_activity, _, _, individual_plan = calculate_maintenance_time(component_list, TW_start, TW_end)
-    print(individual_plan)
-    genome_length = len(ID_activity)
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
+    logger.debug(context.data)
+    genome_length = len(context.ID_activity)
     
     # Handle case when no maintenance activities are scheduled
     if genome_length == 0:
         logger.warning("No maintenance activities found within the specified time window")
         return [], 0.0  # Return empty solution with zero fitness
     
-    population = init_population(population_size, genome_length)
-    best_solution = None
-    best_fitness_value = -float('inf')
-    for generation in range(generations):
-        fitness_values = [fitness_function(genome, C_s, C_d, m, component_list, TW_start, TW_end) for genome in population]
-        map_fitness_to_population = sorted(zip(fitness_values, population), reverse=True)
-        # print("map value: ", list(map_fitness_to_population))
-        # Update best solution
-        current_best_fitness = map_fitness_to_population[0][0]
-        current_best_genome = map_fitness_to_population[0][1]
-        
-        if current_best_fitness >= best_fitness_value:
-            best_fitness_value = current_best_fitness
-            best_solution = current_best_genome
-        
-        print(f"Generation {generation} | Best fitness = {best_fitness_value} | Best genome: {best_solution}")
+    rng = make_rng()
+    population = init_population(population_size, genome_length, rng)
+    if warm_start is not None:
+        seeded = warm_start_genomes(warm_start, int(population_size * WARM_START_FRACTION), rng)
+        population[:len(seeded)] = seeded
+    # fitness of each genome in population, NaN for genomes that still have to be evaluated
+    fitness_values = np.full(population_size, np.nan)
+    if stopping is not None:
+        generations = min(generations, stopping.max_generations or generations)
+        stopping.start()
+    # Offspring are delta-evaluated in-process; with several workers whole batches are evaluated on the pool instead.
+    # Only the pool batches go through the partition cache: a delta evaluation needs the group costs of the parent,
+    # which a cached fitness value does not carry, and costs less than the canonical partition of the child
+    evaluator = ParallelFitnessEvaluator(C_s, C_d, m, context, workers) if workers > 1 else None
+    incremental = IncrementalFitness(C_s, C_d, m, context) if evaluator is None else None
+    cache = FitnessCache(FITNESS_CACHE_SIZE) if evaluator is not None else None
+    # The local search always delta-evaluates its neighbours in-process
+    local_search_fitness = (incremental or IncrementalFitness(C_s, C_d, m, context)) if local_search else None
+    try:
+        _, _, best_solution, best_fitness_value, _ = evolve_population(
+            population, fitness_values, generations, C_s, C_d, m, context, cache, evaluator,
+            p_c_min=p_c_min, p_c_max=p_c_max, p_m_min=p_m_min, p_m_max=p_m_max, stopping=stopping,
+            incremental=incremental, local_search_interval=LOCAL_SEARCH_INTERVAL if local_search else None, rng=rng,
+            local_search_fitness=local_search_fitness)
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+    if local_search:
+        best_solution, best_fitness_value = refine_best(best_solution, best_fitness_value, local_search_fitness, rng, stopping)
+
+    if stopping is not None:
+        stopping.reason = stopping.reason or "max_generations"
+        logger.info(f"Genetic algorithm stopped: {stopping.summary()}")
+    if incremental is not None:
+        logger.info(f"Incremental fitness statistics: {incremental.stats()}")
+    else:
+        logger.info(f"Fitness cache statistics: {cache.stats()}")
+    return best_solution, best_fitness_value
 
-        # Elitism
-        sorted_population = [x for _, x in map_fitness_to_population]
-        new_population = sorted_population[:2]
-   
-        f_avg = np.mean(fitness_values)
-        f_max = np.max(fitness_values)
 
-        # Linear ranking selection and crossover
-        selected = linear_ranking_selection(population, fitness_values)
-      
-        for i in range(2, len(selected), 2):
-            parent1 = selected[i]
-            parent2 = selected[i+1]
-            f_c = max(fitness_function(parent1, C_s, C_d, m, component_list, TW_start, TW_end), fitness_function(parent2, C_s, C_d, m, component_list, TW_start, TW_end))
-            p_c = p_c_max - ((p_c_max - p_c_min) * (f_c - f_avg) / (f_max - f_avg)) if f_c > f_avg else p_c_max
-            child1, child2 = crossover(parent1, parent2, p_c)
-            new_population.extend([child1, child2])
-        # Mutation
-        for i in range(2, len(new_population)):
-            f_m = fitness_function(new_population[i], C_s, C_d, m, component_list, TW_start, TW_end)
-            p_m = p_m_max - ((p_m_max - p_m_min) * (f_max - f_m) / (f_max - f_avg)) if f_m > f_avg else p_m_max
-            new_population[i] = mutate(new_population[i], p_m)
-        
-        population = new_population
+# Per-process state of an island worker, set once by the pool initializer
+_island_problem = None
+_island_signals = (None, None)
+
+
+def _init_island_worker(C_s, C_d, m, context, ga_parameters, signals):
+    global _island_problem, _island_signals
+    _island_problem = (C_s, C_d, m, context, ga_parameters)
+    # (cancel, stop) events shared with the coordinator, which can only reach the workers at process creation
+    _island_signals = signals
+
+
+# copy the cancel and stop events of the request onto the process-shared signals of the island workers, until done
+def _forward_island_signals(events, signals, done):
+    while not done.wait(ISLAND_SIGNAL_INTERVAL):
+        for event, signal in zip(events, signals):
+            if event is not None and event.is_set():
+                signal.set()
+
+
+def _run_island_epoch(state, generations, stopping=None):
+    C_s, C_d, m, context, ga_parameters = _island_problem
+    if stopping is not None:
+        # A cancelled or stopped request ends the epoch at the next generation of every island
+        stopping.cancel, stopping.stop = _island_signals
+    # Each island carries its own random stream, so results do not depend on which process runs it
+    if state["rng"] is None:
+        state["rng"] = make_rng(state["seed"])
+        state["population"] = init_population(ga_parameters["population_size"], len(context.ID_activity), state["rng"])
+        if ga_parameters["warm_start"] is not None:
+            seeded = warm_start_genomes(ga_parameters["warm_start"], int(ga_parameters["population_size"] * WARM_START_FRACTION), state["rng"])
+            state["population"][:len(seeded)] = seeded
+        state["fitness_values"] = np.full(len(state["population"]), np.nan)
+    incremental = IncrementalFitness(C_s, C_d, m, context)
+    # The stage times of the epoch travel back with the state and are merged into the request profiler
+    profiler = StageProfiler() if ga_parameters["profile"] else None
+
+    with profiling(profiler):
+        population, fitness_values, best_solution, best_fitness_value, generations = evolve_population(
+            state["population"], state["fitness_values"], generations, C_s, C_d, m, context, None,
+            p_c_min=ga_parameters["p_c_min"], p_c_max=ga_parameters["p_c_max"],
+            p_m_min=ga_parameters["p_m_min"], p_m_max=ga_parameters["p_m_max"],
+            best_solution=state["best_solution"], best_fitness_value=state["best_fitness"],
+            label=f"Island {state['island']} | Generation", stopping=stopping, first_generation=state["generations"],
+            incremental=incremental, local_search_interval=LOCAL_SEARCH_INTERVAL if ga_parameters["local_search"] else None,
+            rng=state["rng"])
+
+    state.update(population=population, fitness_values=fitness_values, best_solution=best_solution,
+                 best_fitness=best_fitness_value, rng=state["rng"],
+                 generations=state["generations"] + generations,
+                 evaluations=state["evaluations"] + incremental.full_evaluations + incremental.delta_evaluations,
+                 groups_evaluated=state["groups_evaluated"] + incremental.groups_evaluated,
+                 profile=dict(profiler.samples) if profiler is not None else None)
+    return state
+
+
+# ring migration: the best genomes of each island replace the worst genomes of the next island
+def migrate(states, migrants):
+    emigrants = []
+    for state in states:
+        ranking = np.argsort(-state["fitness_values"], kind="stable")
+        emigrants.append([(state["population"][i].copy(), state["fitness_values"][i]) for i in ranking[:migrants]])
+    for k, state in enumerate(states):
+        incoming = emigrants[k - 1]
+        ranking = np.argsort(state["fitness_values"], kind="stable")
+        for i, (genome, fitness) in zip(ranking, incoming):
+            state["population"][i] = genome
+            state["fitness_values"][i] = fitness
+        state["migrants_received"] += len(incoming)
+    return states
+
+
+def island_genetic_algorithm(C_s, C_d, m, component_list, TW_start, TW_end, islands=ISLANDS, migration_interval=MIGRATION_INTERVAL, migrants=MIGRANTS, population_size=POPULATION_SIZE, generations=GENERATIONS, p_c_min=p_c_min, p_c_max=p_c_max, p_m_min=p_m_min, p_m_max=p_m_max, context=None, stopping=None, warm_start=None, local_search=False):
+    """
+    Island-model genetic algorithm: independent sub-populations evolve in separate processes and exchange
+    their best genomes every migration_interval generations.
 
+    Args:
+        islands (int): number of sub-populations, each of population_size genomes
+        migration_interval (int): generations between two migrations
+        migrants (int): genomes sent by each island to the next one at every migration
+        stopping (StoppingCriteria): optional stopping rules; the time limit, target fitness, cancel and stop
+            events are also checked inside the islands at every generation, stagnation is measured on the overall
+            best between migrations
+        warm_start (list): optional genome seeding part of every island's initial population
+        local_search (bool): refine the elites of every island by hill climbing, and the overall best at the end
+        Remaining arguments as for genetic_algorithm.
+
+    Returns:
+        tuple: (best_solution, best_fitness_value, island_statistics)
+    """
+    component_load(component_list)
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
+    genome_length = len(context.ID_activity)
+
+    # Handle case when no maintenance activities are scheduled
+    if genome_length == 0:
+        logger.warning("No maintenance activities found within the specified time window")
+        return [], 0.0, []
+
+    ga_parameters = {"population_size": population_size, "p_c_min": p_c_min, "p_c_max": p_c_max, "p_m_min": p_m_min, "p_m_max": p_m_max,
+                     "warm_start": warm_start, "local_search": local_search, "profile": _profiler.get() is not None}
+    states = [{"island": k + 1, "seed": random.getrandbits(64), "rng": None, "population": None,
+               "fitness_values": None, "best_solution": None, "best_fitness": -float('inf'), "generations": 0,
+               "evaluations": 0, "groups_evaluated": 0, "migrants_received": 0, "profile": None}
+              for k in range(islands)]
+
+    logger.info(f"Starting island genetic algorithm with {islands} islands of {population_size} genomes")
+    mp_context = multiprocessing.get_context("spawn")
+    signals = (mp_context.Event(), mp_context.Event())
+    pool = ProcessPoolExecutor(max_workers=min(islands, os.cpu_count() or 1), mp_context=mp_context,
+                               initializer=_init_island_worker, initargs=(C_s, C_d, m, context, ga_parameters, signals))
+    forwarded = threading.Event()
+    if stopping is not None and (stopping.cancel is not None or stopping.stop is not None):
+        threading.Thread(target=_forward_island_signals, args=((stopping.cancel, stopping.stop), signals, forwarded),
+                         daemon=True).start()
+    try:
+        if stopping is not None:
+            generations = min(generations, stopping.max_generations or generations)
+            stopping.start()
+            # Islands only see the rules that must interrupt an epoch
+            island_stopping = StoppingCriteria(target_fitness=stopping.target_fitness, deadline=stopping.deadline)
+        else:
+            island_stopping = None
+        completed = 0
+        while completed < generations:
+            epoch = min(migration_interval, generations - completed)
+            previous = [(state["generations"], state["evaluations"]) for state in states]
+            states = list(pool.map(_run_island_epoch, states, [epoch] * islands, [island_stopping] * islands))
+            for state, (generations_before, evaluations_before) in zip(states, previous):
+                run_counters.add(generations=state["generations"] - generations_before,
+                                 evaluations=state["evaluations"] - evaluations_before)
+                if state["profile"] is not None:
+                    _profiler.get().merge(state.pop("profile"))
+            completed = max(state["generations"] for state in states)
+            if stopping is not None and stopping.check(completed - 1, max(state["best_fitness"] for state in states),
+                                                       np.concatenate([state["fitness_values"] for state in states])):
+                break
+            if completed < generations and islands > 1:
+                states = migrate(states, migrants)
+    finally:
+        forwarded.set()
+        pool.shutdown()
+
+    if stopping is not None:
+        stopping.reason = stopping.reason or "max_generations"
+        logger.info(f"Island genetic algorithm stopped: {stopping.summary()}")
+    best = max(states, key=lambda state: state["best_fitness"])
+    island_statistics = [
+        {
+            "Island": state["island"],
+            "Best fitness": float(state["best_fitness"]),
+            "Mean fitness": float(np.mean(state["fitness_values"])),
+            "Generations": state["generations"],
+            "Evaluations": state["evaluations"],
+            "Groups evaluated": state["groups_evaluated"],
+            "Migrants received": state["migrants_received"]
+        }
+        for state in states
+    ]
+    logger.info(f"Island statistics: {island_statistics}")
+    best_solution, best_fitness_value = best["best_solution"], best["best_fitness"]
+    if local_search:
+        best_solution, best_fitness_value = refine_best(best_solution, best_fitness_value, IncrementalFitness(C_s, C_d, m, context), make_rng(), stopping)
+    return best_solution, best_fitness_value, island_statistics
+
+
+def contiguous_partition_solver(C_s, C_d, m, component_list, TW_start, TW_end, max_group_size=DP_MAX_GROUP_SIZE, context=None):
+    """
+    Exact dynamic programming over groupings of activities that are contiguous in replacement time.
+
+    Activities are sorted by replacement time and best[j], the best cost benefit of the first j activities, is
+    the maximum over the size l of the last group of best[j - l] + EB(last l activities). The cost benefit of
+    every candidate group comes from the same cost model as the genetic algorithm, all groups of one size in a
+    single batch, so the result is optimal among partitions into contiguous groups of at most max_group_size
+    activities.
+
+    Args:
+        max_group_size (int): largest group considered, None for no limit
+        Remaining arguments as for genetic_algorithm.
+
+    Returns:
+        tuple: (best_solution, best_fitness_value)
+    """
+    component_load(component_list)
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
+    genome_length = len(context.ID_activity)
+
+    # Handle case when no maintenance activities are scheduled
+    if genome_length == 0:
+        logger.warning("No maintenance activities found within the specified time window")
+        return [], 0.0
+
+    longest = min(max_group_size or genome_length, genome_length)
+    order = np.argsort(context.replacement_time, kind="stable")
+    # EB[l - 1, s]: cost benefit of the group of the l activities starting at position s of the sorted order
+    EB = np.full((longest, genome_length), -np.inf)
+    for size in range(1, longest + 1):
+        starts = np.arange(genome_length - size + 1)
+        activity = order[starts[:, None] + np.arange(size)].ravel()
+        group_index = np.repeat(starts, size)
+        EB[size - 1, starts] = group_cost_benefit(activity, group_index, len(starts), C_s, C_d, m, context)
+
+    best = np.zeros(genome_length + 1)
+    last_group_size = np.zeros(genome_length + 1, dtype=int)
+    for j in range(1, genome_length + 1):
+        sizes = np.arange(1, min(longest, j) + 1)
+        candidates = best[j - sizes] + EB[sizes - 1, j - sizes]
+        k = int(np.argmax(candidates))
+        best[j], last_group_size[j] = candidates[k], sizes[k]
+
+    # Walk back through the chosen groups and label the activities of each one
+    best_solution = [0] * genome_length
+    j, group = genome_length, 0
+    while j > 0:
+        group += 1
+        for activity in order[j - last_group_size[j]:j].tolist():
+            best_solution[activity] = group
+        j -= last_group_size[j]
+    best_solution = list(canonical_partition(best_solution))
+    best_fitness_value = fitness_function(best_solution, C_s, C_d, m, context)
+    logger.info(f"Contiguous partition solver: {group} groups over {genome_length} activities, best fitness = {best_fitness_value}")
     return best_solution, best_fitness_value
 
 def convert_right_form(components, durations):
@@ -526,31 +1552,23 @@ def convert_right_form(components, durations):
     ]
 
 
-def mapping_to_UI(genome, m, component_list, TW_start, TW_end):
-    _, map_activity_to_IDcomponent, map_activity_to_replacement_time, _ = calculate_maintenance_time(component_list, TW_start, TW_end)
+def mapping_to_UI(genome, m, context):
     N, G_activity = decode(genome)
-    G_component = mapping_activity_to_componentID(map_activity_to_IDcomponent, G_activity)
-    G_duration, _ = mapping_IDcomponent_to_duration(G_component, component_list)
-    replacement_time = mapping_activity_to_replacement_time(map_activity_to_replacement_time, G_activity)
+    G_component = mapping_activity_to_componentID(context.map_activity_to_IDcomponent, G_activity)
+    G_duration, _ = mapping_activity_to_duration(context, G_activity)
+    replacement_time = mapping_activity_to_value(context.replacement_time, G_activity)
     
     d_Gk = calculate_d_Gk(G_duration, m, w_max)
-    _ , t_group = penalty_cost(G_activity, component_list, TW_start, TW_end)
+    _ , t_group = penalty_cost(G_activity, context)
     estimate_duration = convert_right_form(G_component, d_Gk)
     estimate_replacement_time = convert_right_form(G_component, t_group)
     return G_duration, G_component, replacement_time, estimate_duration, estimate_replacement_time
 
-def convert_component_ids_to_names(G_component, component_list):
-    # Load the JSON file with component info
-    # with open(json_path, 'r', encoding='utf-8') as f:
-        # component_data = json.load(f)
-
-    # Create a mapping from ID to Component name
-    id_to_name = {entry["Module ID"]: entry["Module"] for entry in component_list}
-
+def convert_component_ids_to_names(G_component, component_index):
     # Replace component IDs with names
     G_component_named = []
     for group_id, component_ids in G_component:
-        names = [id_to_name[comp_id] for comp_id in component_ids]
+        names = [component_index.name[row] for row in component_index.rows(component_ids)]
         G_component_named.append((group_id, names))
 
     return G_component_named
@@ -575,16 +1593,17 @@ def combine_group_data(G_duration, G_component, replacement_time, G_component_na
 
     return combined_data
 
-def output_json_file(best_individual, best_fitness, TW_start, TW_end, m, component_list):
-    ID_activity, _, _, data = calculate_maintenance_time(component_list, TW_start, TW_end)
+def output_json_file(best_individual, best_fitness, TW_start, TW_end, m, component_list, context=None):
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
 
-    _, G_component, _, estimate_duration, estimate_replacement_time = mapping_to_UI(best_individual, m, component_list, TW_start, TW_end)
-    G_duration_individual, G_component_individual, replacement_time_individual, _, _ = mapping_to_UI(ID_activity, m, component_list, TW_start, TW_end) 
+    _, G_component, _, estimate_duration, estimate_replacement_time = mapping_to_UI(best_individual, m, context)
+    G_duration_individual, G_component_individual, replacement_time_individual, _, _ = mapping_to_UI(context.ID_activity, m, context) 
 
-    G_component_named = convert_component_ids_to_names(G_component, component_list)
+    G_component_named = convert_component_ids_to_names(G_component, context.components)
     group_maintenance = combine_group_data(estimate_duration, G_component, estimate_replacement_time, G_component_named)
 
-    G_component_named_individual = convert_component_ids_to_names(G_component_individual, component_list)
+    G_component_named_individual = convert_component_ids_to_names(G_component_individual, context.components)
     individual_maintenance = combine_group_data(G_duration_individual, G_component_individual, replacement_time_individual, G_component_named_individual)
     final_output = {
                         "Cost savings": best_fitness,
@@ -614,7 +1633,7 @@ def output_json_file(best_individual, best_fitness, TW_start, TW_end, m, compone
     print(f"File saved to: {output_path}")
 
 #Function to convert the algorithm output to the proper format
-def format_output(best_individual, best_fitness, TW_start, TW_end, m, component_list):
+def format_output(best_individual, best_fitness, TW_start, TW_end, m, component_list, context=None):
     """
     Convert the algorithm output to the proper format for JSON output.
     Args:
@@ -622,10 +1641,12 @@ def format_output(best_individual, best_fitness, TW_start, TW_end, m, component_
         best_fitness (float): The fitness value of the best individual.
         TW_start (float): The beginning of the time window.
         TW_end (float): The end of the time window.
+        context (ProblemContext, optional): Precomputed problem context, built from component_list if omitted.
     Returns:
         dict: A dictionary containing the formatted output.
     """
-    ID_activity, _, _, data = calculate_maintenance_time(component_list, TW_start, TW_end)
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
 
     # Handle case when no maintenance activities are found
     if not best_individual or len(best_individual) == 0:
@@ -634,14 +1655,14 @@ def format_output(best_individual, best_fitness, TW_start, TW_end, m, component_
         individual_maintenance = {}
     else:
         # Call your existing mapping functions
-        _, G_component, _, estimate_duration, estimate_replacement_time = mapping_to_UI(best_individual, m, component_list, TW_start, TW_end)
-        G_duration_individual, G_component_individual, replacement_time_individual, _, _ = mapping_to_UI(ID_activity, m, component_list, TW_start, TW_end)
+        _, G_component, _, estimate_duration, estimate_replacement_time = mapping_to_UI(best_individual, m, context)
+        G_duration_individual, G_component_individual, replacement_time_individual, _, _ = mapping_to_UI(context.ID_activity, m, context)
         
         # Convert component IDs to names
-        G_component_named = convert_component_ids_to_names(G_component, component_list)
+        G_component_named = convert_component_ids_to_names(G_component, context.components)
         group_maintenance = combine_group_data(estimate_duration, G_component, estimate_replacement_time, G_component_named)
         
-        G_component_named_individual = convert_component_ids_to_names(G_component_individual, component_list)
+        G_component_named_individual = convert_component_ids_to_names(G_component_individual, context.components)
         individual_maintenance = combine_group_data(G_duration_individual, G_component_individual, replacement_time_individual, G_component_named_individual)
     
     # Create output dictionary with proper key names to match the expected format
@@ -733,80 +1754,321 @@ def generate_failure_json(component_list, TW_start, TW_end):
     """
     Generate failure schedule JSON for all components within the time window.
 
+    The k-th activity of a component is due at LMAT + k * MTBF. The range of k falling in the window is
+    computed per component, then all activities are generated at once, so long horizons are not truncated.
+
     Args:
         component_list (list): list of component dicts with MTBF, Last Maintenance Action Time, etc.
         TW_start (datetime): window start time
         TW_end (datetime): window end time
 
     Returns:
-        dict: JSON structure with window and failure activities
+        dict: JSON structure with window and failure activities, stored as columns:
+              "ID activity" (int array), "Replacement time" (float array) and "Module ID" (object array)
     """
-    data = {
+    TW_end_h = (TW_end - TW_start).total_seconds() / 3600.0
+    # skip modules with invalid MTBF
+    valid = [comp for comp in component_list if comp["MTBF"] > 0]
+    MTBF = np.array([comp["MTBF"] for comp in valid], dtype=float)
+    module_id = np.array([comp["Module ID"] for comp in valid], dtype=object)
+
+    # Convert LMAT to relative hours from TW_start
+    LMAT_h = np.array([(comp["Last Maintenance Action Time"] - TW_start).total_seconds() / 3600.0 for comp in valid], dtype=float)
+
+    # First k: if LMAT is before the window start, the first maintenance in the window, otherwise k=1
+    k_first = np.where(LMAT_h <= 0, np.maximum(1, np.floor(-LMAT_h / MTBF) + 1), 1).astype(np.int64)
+    # Last k: the last maintenance before the window end, corrected for rounding of the division
+    k_last = np.floor((TW_end_h - LMAT_h) / MTBF).astype(np.int64)
+    k_last -= LMAT_h + k_last * MTBF > TW_end_h
+    k_last += LMAT_h + (k_last + 1) * MTBF <= TW_end_h
+    counts = np.maximum(k_last - k_first + 1, 0)
+
+    # All k values, component after component
+    component = np.repeat(np.arange(len(valid)), counts)
+    k = k_first[component] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    replacement_time = LMAT_h[component] + k * MTBF[component]
+    # Must be within the window
+    inside = replacement_time >= 0
+    component, replacement_time = component[inside], replacement_time[inside]
+
+    logger.debug(f"Generated {len(component)} maintenance activities for {len(valid)} components over {TW_end_h:.2f} hours")
+
+    return {
         "window": {
             "Begin": 0.0,
-            "End": (TW_end - TW_start).total_seconds() / 3600.0
+            "End": TW_end_h
         },
-        "failure": []
+        "failure": {
+            "ID activity": np.arange(1, len(component) + 1),
+            "Replacement time": np.round(replacement_time, 3),
+            "Module ID": module_id[component]
+        }
     }
 
-    activity_id = 1
 
-    for comp in component_list:
-        MTBF = comp["MTBF"]
-        LMAT = comp["Last Maintenance Action Time"]
-        ModuleID = comp["Module ID"]
+def calculate_maintenance_time(component_list, TW_start, TW_end):
+    data = generate_failure_json(component_list, TW_start, TW_end)
+    # print(data)
+    t = data["failure"]["Replacement time"].tolist()
+    ID_activity = data["failure"]["ID activity"].tolist()
+    ID_component = data["failure"]["Module ID"].tolist()
+    map_activity_to_IDcomponent = list(zip(ID_activity, ID_component))      # list of tuple (ID_component, ID_activity)   
+    map_activity_to_replacement_time = list(zip(ID_activity, t))            # list of tuple (ID_component, ID_activity)
+    return ID_activity, map_activity_to_IDcomponent, map_activity_to_replacement_time, data
+
+
+@dataclass(frozen=True)
+class ComponentIndex:
+    """
+    Columnar view of component_list with a hash index from Module ID to row.
 
-        if MTBF <= 0:
-            continue  # skip modules with invalid MTBF
+    When a Module ID appears more than once, the first component is used.
+    """
+    row_of_module: dict
+    module_id: tuple
+    name: tuple
+    duration: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+
+    def rows(self, module_ids):
+        try:
+            return np.array([self.row_of_module[d] for d in module_ids], dtype=int)
+        except KeyError as e:
+            logger.error(f"Component with Module ID '{e.args[0]}' not found in component_list")
+            raise ValueError(f"Component with Module ID '{e.args[0]}' not found in component list")
+
+
+def build_component_index(component_list):
+    row_of_module = {}
+    for row, item in enumerate(component_list):
+        row_of_module.setdefault(item["Module ID"], row)
+
+    def column(key):
+        values = np.array([item[key] for item in component_list], dtype=float)
+        values.flags.writeable = False
+        return values
+
+    return ComponentIndex(
+        row_of_module=row_of_module,
+        module_id=tuple(item["Module ID"] for item in component_list),
+        name=tuple(item["Module"] for item in component_list),
+        duration=column("Average maintenance duration"),
+        alpha=column("Alpha"),
+        beta=column("Beta")
+    )
+
+
+@dataclass(frozen=True)
+class ProblemContext:
+    """
+    Immutable per-request activity table used by the fitness and output functions.
 
-        # Convert LMAT to relative hours from TW_start
-        LMAT_h = (LMAT - TW_start).total_seconds() / 3600.0
-        TW_end_h = (TW_end - TW_start).total_seconds() / 3600.0
-        
-        logger.debug(f"Component {ModuleID}: LMAT_h={LMAT_h:.2f}, TW_end_h={TW_end_h:.2f}, MTBF={MTBF}")
+    Arrays are indexed by activity position (ID activity - 1), so a group of activities
+    can be mapped to its durations, alpha and beta values without searching component_list.
+    """
+    ID_activity: tuple
+    ID_component: tuple
+    component_index: np.ndarray
+    replacement_time: np.ndarray
+    duration: np.ndarray
+    alpha: np.ndarray
+    beta: np.ndarray
+    map_activity_to_IDcomponent: tuple
+    components: ComponentIndex
+    data: dict
+
+
+def build_problem_context(component_list, TW_start, TW_end):
+    """
+    Generate the activity table once for a request and store it as read-only arrays.
 
-        # Find the first maintenance activity that falls within the time window
-        # If LMAT is before the window, start from k=1
-        # If LMAT is after the window start, we need to find which k value brings us into the window
-        
-        if LMAT_h <= 0:
-            # LMAT is before window start, find first maintenance in window
-            k = max(1, int(-LMAT_h / MTBF) + 1)
-        else:
-            # LMAT is after window start, start from k=1 
-            k = 1
-        
+    Args:
+        component_list (list): list of component dicts with MTBF, Alpha, Beta, etc.
+        TW_start (datetime): window start time
+        TW_end (datetime): window end time
+
+    Returns:
+        ProblemContext: activity IDs, component indices, replacement times, durations, alpha and beta
+    """
+    ID_activity, map_activity_to_IDcomponent, map_activity_to_replacement_time, data = calculate_maintenance_time(component_list, TW_start, TW_end)
+
+    components = build_component_index(component_list)
+    ID_component = tuple(data["failure"]["Module ID"].tolist())
+    component_index = components.rows(ID_component)
+
+    def column(values):
+        values = values[component_index]
+        values.flags.writeable = False
+        return values
+
+    component_index.flags.writeable = False
+    replacement_time = data["failure"]["Replacement time"]
+    replacement_time.flags.writeable = False
+
+    return ProblemContext(
+        ID_activity=tuple(ID_activity),
+        ID_component=ID_component,
+        component_index=component_index,
+        replacement_time=replacement_time,
+        duration=column(components.duration),
+        alpha=column(components.alpha),
+        beta=column(components.beta),
+        map_activity_to_IDcomponent=tuple(map_activity_to_IDcomponent),
+        components=components,
+        data=data
+    )
+
+
+def branch_and_bound_solver(C_s, C_d, m, component_list, TW_start, TW_end, context=None):
+    """
+    Exact solver over all set partitions of the activities, for small activity counts.
+
+    The cost benefit EB of every subset of activities is computed in one batch with the GA's cost model. The
+    search then builds partitions group by group, always placing the lowest unassigned activity, and prunes a
+    branch when its value plus an optimistic bound on the unassigned activities cannot beat the incumbent.
+    The bound gives every activity the best EB per activity of any group containing it, which is never
+    exceeded by a partition. The contiguous partition solution is the first incumbent.
+
+    Args:
+        Same as genetic_algorithm, at most EXACT_MAX_ACTIVITIES activities.
+
+    Returns:
+        tuple: (best_solution, best_fitness_value)
+    """
+    component_load(component_list)
+    if context is None:
+        context = build_problem_context(component_list, TW_start, TW_end)
+    genome_length = len(context.ID_activity)
+
+    # Handle case when no maintenance activities are scheduled
+    if genome_length == 0:
+        logger.warning("No maintenance activities found within the specified time window")
+        return [], 0.0
+    if genome_length > EXACT_MAX_ACTIVITIES:
+        raise ValueError(f"The exact solver supports at most {EXACT_MAX_ACTIVITIES} activities, got {genome_length}")
+
+    # EB and size of every non-empty subset, indexed by its bitmask over the activities
+    masks = np.arange(1 << genome_length)
+    members = (masks[:, None] >> np.arange(genome_length)) & 1
+    group_index, activity = np.nonzero(members[1:])
+    EB = np.zeros(len(masks))
+    EB[1:] = group_cost_benefit(activity, group_index, len(masks) - 1, C_s, C_d, m, context)
+    size = members.sum(axis=1)
+    # Optimistic share of each activity and bound of every set of unassigned activities
+    share = np.where(members[1:], (EB[1:] / size[1:])[:, None], -np.inf).max(axis=0)
+    bound = (members * share).sum(axis=1).tolist()
+    EB = EB.tolist()
+
+    best_solution, best_fitness_value = contiguous_partition_solver(C_s, C_d, m, component_list, TW_start, TW_end, context=context)
+    incumbent = [sum(EB[sum(1 << a for a, g in enumerate(best_solution) if g == group)] for group in set(best_solution)), None]
+    nodes = 0
+
+    def search(remaining, value, groups):
+        nonlocal nodes
+        nodes += 1
+        if remaining == 0:
+            if value > incumbent[0]:
+                incumbent[:] = [value, list(groups)]
+            return
+        lowest = remaining & -remaining
+        rest = remaining ^ lowest
+        # Groups containing the lowest unassigned activity, best first
+        candidates = []
+        subset = rest
         while True:
-            replacement_time = LMAT_h + k * MTBF
-            if replacement_time > TW_end_h:
-                break
-            if replacement_time >= 0:  # Must be within the window
-                data["failure"].append({
-                    "ID activity": activity_id,
-                    "Replacement time": round(replacement_time, 3),
-                    "Module ID": ModuleID
-                })
-                activity_id += 1
-                logger.debug(f"Added maintenance activity {activity_id-1} at time {replacement_time:.2f}")
-            k += 1
-            
-            # Safety break to prevent infinite loops
-            if k > 1000:
-                logger.warning(f"Breaking infinite loop for component {ModuleID}")
+            group = subset | lowest
+            if value + EB[group] + bound[remaining ^ group] > incumbent[0]:
+                candidates.append(group)
+            if subset == 0:
                 break
+            subset = (subset - 1) & rest
+        candidates.sort(key=lambda group: EB[group] + bound[remaining ^ group], reverse=True)
+        for group in candidates:
+            if value + EB[group] + bound[remaining ^ group] > incumbent[0]:
+                groups.append(group)
+                search(remaining ^ group, value + EB[group], groups)
+                groups.pop()
+
+    search((1 << genome_length) - 1, 0.0, [])
+    if incumbent[1] is not None:
+        best_solution = [0] * genome_length
+        for label, group in enumerate(incumbent[1], start=1):
+            for a in range(genome_length):
+                if group >> a & 1:
+                    best_solution[a] = label
+        best_solution = list(canonical_partition(best_solution))
+        best_fitness_value = fitness_function(best_solution, C_s, C_d, m, context)
+    logger.info(f"Branch and bound solver: {nodes} nodes over {genome_length} activities, best fitness = {best_fitness_value}")
+    return best_solution, best_fitness_value
 
-    return data
 
+# fingerprint of the inputs that define a grouping problem, apart from the time window and the last maintenance
+# times, which move every time a module is re-planned
+def input_fingerprint(setup_cost, downtime_cost_rate, no_repairmen, components):
+    keys = ("Module ID", "Alpha", "Beta", "Average maintenance duration", "MTBF")
+    inputs = [setup_cost, downtime_cost_rate, no_repairmen, sorted([str(item.get(key)) for key in keys] for item in components)]
+    return hashlib.sha256(json.dumps(inputs).encode("utf-8")).hexdigest()
 
-def calculate_maintenance_time(component_list, TW_start, TW_end):
-    data = generate_failure_json(component_list, TW_start, TW_end)
-    # print(data)
-    t = [entry["Replacement time"] for entry in data["failure"]]
-    ID_activity = [entry["ID activity"] for entry in data["failure"]]
-    ID_component = [entry["Module ID"] for entry in data["failure"]]
-    map_activity_to_IDcomponent = list(zip(ID_activity, ID_component))      # list of tuple (ID_component, ID_activity)   
-    map_activity_to_replacement_time = list(zip(ID_activity, t))            # list of tuple (ID_component, ID_activity)
-    return ID_activity, map_activity_to_IDcomponent, map_activity_to_replacement_time, data
+
+# schedule of a genome as activities (Module ID, absolute replacement time, group) that can be mapped to another window
+def schedule_activities(genome, context, TW_start):
+    return [
+        {
+            "Module ID": module_id,
+            "Replacement time": (TW_start + timedelta(hours=float(t))).isoformat(),
+            "Group": group
+        }
+        for module_id, t, group in zip(context.ID_component, context.replacement_time.tolist(), canonical_partition(genome))
+    ]
+
+
+def remap_schedule(schedule, context, components, TW_start):
+    """
+    Map a stored schedule onto the activities of a new request.
+
+    Each activity takes the group of the stored activity of the same component closest in time, when it is less
+    than half an MTBF away; activities without such a match are left in a group of their own.
+
+    Args:
+        schedule (list): stored activities ({"Module ID", "Replacement time", "Group"})
+        context (ProblemContext): activity table of the new request
+        components (list): component list of the new request
+        TW_start (datetime): start of the new time window
+
+    Returns:
+        list: genome over the activities of context, None when no activity could be matched
+    """
+    MTBF = {item["Module ID"]: item["MTBF"] for item in components}
+    stored = {}
+    for activity in schedule:
+        t = (datetime.fromisoformat(activity["Replacement time"]) - TW_start).total_seconds() / 3600.0
+        stored.setdefault(activity["Module ID"], []).append((t, activity["Group"]))
+
+    genome = []
+    matched = 0
+    unmatched_group = max((activity["Group"] for activity in schedule), default=0)
+    for module_id, t in zip(context.ID_component, context.replacement_time.tolist()):
+        candidates = stored.get(module_id, [])
+        nearest = min(candidates, key=lambda candidate: abs(candidate[0] - t), default=None)
+        if nearest is not None and abs(nearest[0] - t) < MTBF[module_id] / 2:
+            genome.append(nearest[1])
+            matched += 1
+        else:
+            unmatched_group += 1
+            genome.append(unmatched_group)
+    return list(canonical_partition(genome)) if matched else None
+
+
+# initial genomes seeded from a warm-start genome: the genome itself and copies with one random swap each
+def warm_start_genomes(genome, count, rng):
+    genomes = np.tile(np.asarray(genome, dtype=genome_dtype(len(genome))), (max(count, 0), 1))
+    mutate(genomes[1:], 1.0, rng)
+    return genomes
+
+
+def solution_store():
+    return SolutionStore(SOLUTION_STORE_PATH) if SOLUTION_STORE_PATH else None
 
 
 # Function to process API request and prepare Kafka event data
@@ -818,7 +2080,11 @@ def async_processing_grouping_maintenance_request(
     smart_service: str,
     module: str,
     TW_start,
-    TW_end):
+    TW_end,
+    options=None,
+    progress=None,
+    cancel=None,
+    stop=None):
     """
     Process grouping maintenance request and prepare for Kafka publishing.
     This function is called from the API and handles the complete workflow:
@@ -835,6 +2101,14 @@ def async_processing_grouping_maintenance_request(
         module (str): Production module identifier
         TW_start (datetime): Start of time window
         TW_end (datetime): End of time window
+        options (dict, optional): Solver settings ("solver", "islands", "migrationInterval", "migrants", "warmStart",
+            "maxGroupSize", "localSearch", "profile") and
+            stopping criteria ("maxGenerations", "timeLimit", "stagnationGenerations", "targetFitness")
+        progress (callable, optional): progress(dict) with the generations, best fitness, population diversity and
+            elapsed time, called after every generation of the genetic algorithms (every epoch with the island solver)
+        cancel (threading.Event, optional): stops the genetic algorithms at their next generation once set; the
+            results then hold the best schedule found so far, with "cancelled" as stopping reason
+        stop (threading.Event, optional): same as cancel, with "stopped" as stopping reason, to accept an early answer
         
     Returns:
         dict: Event data ready for Kafka publishing
@@ -860,15 +2134,84 @@ def async_processing_grouping_maintenance_request(
         logger.info(f"Time Window: {TW_start} to {TW_end}")
         logger.info("-------------------------------------")
         
-        # Run the genetic algorithm with provided time window
-        logger.info("Executing genetic algorithm for maintenance optimization")
-        best_individual, best_fitness = genetic_algorithm(setup_cost, downtime_cost_rate, no_repairmen, components, TW_start, TW_end)
-        logger.info(f"Genetic algorithm completed - Best fitness: {best_fitness}")
-        logger.info(f"Best individual solution: {best_individual}")
+        options = options or {}
+        # Opt-in stage timings of the run, attached to the results
+        profiler = StageProfiler() if options.get("profile", False) else None
+        with profiling(profiler):
+            context = build_problem_context(components, TW_start, TW_end)
+            # Small requests are solved exactly unless a solver is requested
+            solver = options.get("solver") or ("exact" if 0 < len(context.ID_activity) <= EXACT_MAX_ACTIVITIES else "genetic")
+            island_statistics = None
+            stopping = StoppingCriteria(
+                max_generations=options.get("maxGenerations", GENERATIONS),
+                time_limit=options.get("timeLimit"),
+                stagnation_generations=options.get("stagnationGenerations"),
+                target_fitness=options.get("targetFitness"),
+                progress=progress,
+                cancel=cancel,
+                stop=stop)
+
+            # Seed part of the initial population with the last schedule stored for this module
+            store = solution_store()
+            fingerprint = input_fingerprint(setup_cost, downtime_cost_rate, no_repairmen, components)
+            warm_start = None
+            if store is not None and options.get("warmStart", True) and context.ID_activity:
+                try:
+                    schedule = store.load(module, fingerprint)
+                    warm_start = remap_schedule(schedule, context, components, TW_start) if schedule else None
+                except Exception as e:
+                    logger.warning(f"Could not load the stored schedule of module {module}: {e}")
+                logger.info(f"Warm start from a stored schedule: {warm_start is not None}")
+
+            # Run the genetic algorithm with provided time window
+            if solver == "island":
+                logger.info("Executing island genetic algorithm for maintenance optimization")
+                best_individual, best_fitness, island_statistics = island_genetic_algorithm(
+                    setup_cost, downtime_cost_rate, no_repairmen, components, TW_start, TW_end,
+                    islands=options.get("islands", ISLANDS),
+                    migration_interval=options.get("migrationInterval", MIGRATION_INTERVAL),
+                    migrants=options.get("migrants", MIGRANTS),
+                    generations=stopping.max_generations,
+                    context=context, stopping=stopping, warm_start=warm_start, local_search=options.get("localSearch", False))
+            elif solver == "exact":
+                logger.info("Executing branch and bound solver for maintenance optimization")
+                stopping.start()
+                best_individual, best_fitness = branch_and_bound_solver(
+                    setup_cost, downtime_cost_rate, no_repairmen, components, TW_start, TW_end, context=context)
+                stopping.reason = "optimal"
+            elif solver == "dp":
+                logger.info("Executing contiguous partition solver for maintenance optimization")
+                stopping.start()
+                best_individual, best_fitness = contiguous_partition_solver(
+                    setup_cost, downtime_cost_rate, no_repairmen, components, TW_start, TW_end,
+                    max_group_size=options.get("maxGroupSize", DP_MAX_GROUP_SIZE), context=context)
+                stopping.reason = "optimal"
+            elif solver == "genetic":
+                logger.info("Executing genetic algorithm for maintenance optimization")
+                best_individual, best_fitness = genetic_algorithm(setup_cost, downtime_cost_rate, no_repairmen, components, TW_start, TW_end,
+                                                                  generations=stopping.max_generations, context=context, stopping=stopping,
+                                                                  warm_start=warm_start, local_search=options.get("localSearch", False))
+            else:
+                raise ValueError(f"Unknown solver '{solver}'")
+            logger.info(f"Genetic algorithm completed - Best fitness: {best_fitness}")
+            logger.info(f"Best individual solution: {best_individual}")
+
+            # The partial schedule of a superseded request must not seed later warm starts
+            if store is not None and best_individual and stopping.reason != "cancelled":
+                try:
+                    store.save(module, fingerprint, schedule_activities(best_individual, context, TW_start), best_fitness)
+                except Exception as e:
+                    logger.warning(f"Could not store the schedule of module {module}: {e}")
         
-        # Format the algorithm output
-        logger.info("Formatting algorithm output for API response")
-        algorithm_results = format_output(best_individual, best_fitness, TW_start, TW_end, no_repairmen, components)
+            # Format the algorithm output
+            logger.info("Formatting algorithm output for API response")
+            algorithm_results = format_output(best_individual, best_fitness, TW_start, TW_end, no_repairmen, components, context=context)
+            algorithm_results.update(stopping.summary())
+        if island_statistics is not None:
+            algorithm_results["Island statistics"] = island_statistics
+        if profiler is not None:
+            algorithm_results["Profile"] = profiler.stats()
+            logger.info(f"Stage profile: {algorithm_results['Profile']}")
         logger.info("Algorithm results formatted successfully")
         
         # Prepare Kafka event data
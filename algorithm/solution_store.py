@@ -0,0 +1,58 @@
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+
+class SolutionStore:
+    def __init__(self, path, keep=20):
+        """
+        Persistent store of the best grouping schedules, keyed by module and input fingerprint
+
+        :param path: SQLite database file, created when missing
+        :param keep: Number of schedules kept per module, older ones are removed on save
+        """
+        self.path = path
+        self.keep = keep
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "module TEXT NOT NULL, fingerprint TEXT NOT NULL, schedule TEXT NOT NULL, "
+                "fitness REAL NOT NULL, updated TEXT NOT NULL, PRIMARY KEY (module, fingerprint))")
+
+    def _connect(self):
+        # One short-lived connection per call, so the store can be used from any worker thread
+        return sqlite3.connect(self.path, timeout=10)
+
+    def load(self, module, fingerprint):
+        """
+        Schedule stored for the same inputs, or else the most recent schedule of the module
+
+        :param module: Production module identifier
+        :param fingerprint: Fingerprint of the request inputs
+        :return: Stored schedule (list of activities), None when the module has no schedule
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT schedule FROM solutions WHERE module = ? ORDER BY fingerprint = ? DESC, updated DESC LIMIT 1",
+                (module, fingerprint)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, module, fingerprint, schedule, fitness):
+        """
+        Store the best schedule of a run, replacing the one stored for the same inputs
+
+        :param module: Production module identifier
+        :param fingerprint: Fingerprint of the request inputs
+        :param schedule: List of activities ({"Module ID", "Replacement time", "Group"})
+        :param fitness: Cost savings of the schedule
+        """
+        updated = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")
+        with closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO solutions (module, fingerprint, schedule, fitness, updated) VALUES (?, ?, ?, ?, ?)",
+                (module, fingerprint, json.dumps(schedule), float(fitness), updated))
+            connection.execute(
+                "DELETE FROM solutions WHERE module = ? AND fingerprint NOT IN "
+                "(SELECT fingerprint FROM solutions WHERE module = ? ORDER BY updated DESC LIMIT ?)",
+                (module, module, self.keep))
@@ -0,0 +1,161 @@
+"""
+Benchmark of the grouping maintenance optimizer (PdM1) on synthetic component fleets.
+
+For every fleet size and time window it measures:
+    - fitness evaluation time per genome, with fitness_function and with the batched population_fitness
+    - cost of one GA generation (evolve_population)
+    - end-to-end async_processing_grouping_maintenance_request runs
+
+Results are written as JSON so they can be compared between versions.
+
+Usage (from the repository root):
+    python benchmark/grouping_benchmark.py --sizes 10,100,1000 --windows 7,30,365 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithm import algorithm  # noqa: E402
+
+
+def synthetic_fleet(size, TW_start, seed):
+    """
+    Generate a component list with varied MTBF, durations and penalty weights.
+    Last maintenance actions are spread over the month before the window.
+    """
+    rng = random.Random(seed)
+    component_list = []
+    for i in range(size):
+        component_list.append({
+            "Module ID": str(100000 + i),
+            "Module": f"SYNTHETIC MODULE {i}",
+            "Stage": "SYNTHETIC",
+            "Cell": f"CELL {i % 10}",
+            "Alpha": rng.choice([1, 5, 10]),
+            "Beta": round(rng.uniform(3.0, 20.0), 1),
+            "Average maintenance duration": round(rng.lognormvariate(0.3, 0.8), 3),
+            "MTBF": round(rng.uniform(48.0, 2500.0), 3),
+            "Last Maintenance Action Time": TW_start - timedelta(hours=rng.uniform(0.0, 720.0))
+        })
+    return component_list
+
+
+def timed(function, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return {"min": min(durations), "median": statistics.median(durations), "max": max(durations)}
+
+
+def benchmark_case(size, window_days, args):
+    TW_start = datetime(2025, 9, 1)
+    TW_end = TW_start + timedelta(days=window_days)
+    component_list = synthetic_fleet(size, TW_start, args.seed + size)
+    context = algorithm.build_problem_context(component_list, TW_start, TW_end)
+    genome_length = len(context.ID_activity)
+    case = {"components": size, "window_days": window_days, "activities": genome_length}
+    if genome_length == 0:
+        return case
+
+    random.seed(args.seed)
+    population = algorithm.init_population(args.population_size, genome_length)
+
+    # Fitness evaluation, per genome
+    single = timed(lambda: [algorithm.fitness_function(genome, args.setup_cost, args.downtime_cost_rate, args.repairmen, context)
+                            for genome in population[:args.fitness_samples]], args.repeats)
+    batch = timed(lambda: algorithm.population_fitness(population, args.setup_cost, args.downtime_cost_rate, args.repairmen, context), args.repeats)
+    case["fitness_function_per_genome_s"] = {k: v / min(args.fitness_samples, len(population)) for k, v in single.items()}
+    case["population_fitness_per_genome_s"] = {k: v / len(population) for k, v in batch.items()}
+
+    # GA generations, starting from the same population each time
+    def run_generations():
+        incremental = algorithm.IncrementalFitness(args.setup_cost, args.downtime_cost_rate, args.repairmen, context)
+        algorithm.evolve_population(population.copy(), np.full(len(population), np.nan), args.generations,
+                                    args.setup_cost, args.downtime_cost_rate, args.repairmen, context, None,
+                                    incremental=incremental)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generation = timed(run_generations, args.repeats)
+    case["generation_s"] = {k: v / args.generations for k, v in generation.items()}
+
+    # End-to-end request processing, with the solver pinned so that every case of the series times the same one
+    # (by default small cases would be handed to the exact solver)
+    options = {"maxGenerations": args.end_to_end_generations, "solver": args.solver}
+    event = {}
+
+    def run_request():
+        event.update(algorithm.async_processing_grouping_maintenance_request(
+            args.setup_cost, args.downtime_cost_rate, args.repairmen, component_list,
+            "benchmark", "benchmark", TW_start, TW_end, options))
+    with contextlib.redirect_stdout(io.StringIO()):
+        case["end_to_end_s"] = timed(run_request, args.repeats)
+    case["end_to_end_solver"] = args.solver
+    case["end_to_end_generations"] = args.end_to_end_generations
+    case["cost_savings"] = float(event["results"]["Cost savings"]) if event.get("results") else None
+    return case
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the grouping maintenance optimizer on synthetic fleets")
+    parser.add_argument("--sizes", default="10,50,200,1000", help="comma-separated numbers of components")
+    parser.add_argument("--windows", default="7,30,365", help="comma-separated time window lengths in days")
+    parser.add_argument("--population-size", type=int, default=algorithm.POPULATION_SIZE)
+    parser.add_argument("--generations", type=int, default=10, help="generations timed for the per-generation cost")
+    parser.add_argument("--end-to-end-generations", type=int, default=50, help="generation cap of the end-to-end runs")
+    parser.add_argument("--solver", default="genetic", choices=["genetic", "island", "exact", "dp"],
+                        help="solver of the end-to-end runs")
+    parser.add_argument("--fitness-samples", type=int, default=20, help="genomes timed with fitness_function")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-activities", type=int, default=20000, help="skip cases with more activities")
+    parser.add_argument("--setup-cost", type=float, default=500.0)
+    parser.add_argument("--downtime-cost-rate", type=float, default=100.0)
+    parser.add_argument("--repairmen", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write, printed to stdout when omitted")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    cases = []
+    for size in [int(x) for x in args.sizes.split(",")]:
+        for window_days in [int(x) for x in args.windows.split(",")]:
+            TW_start = datetime(2025, 9, 1)
+            activities = len(algorithm.build_problem_context(
+                synthetic_fleet(size, TW_start, args.seed + size), TW_start, TW_start + timedelta(days=window_days)).ID_activity)
+            if activities > args.max_activities:
+                cases.append({"components": size, "window_days": window_days, "activities": activities, "skipped": True})
+                continue
+            cases.append(benchmark_case(size, window_days, args))
+            print(f"components={size} window={window_days}d activities={activities} done", file=sys.stderr)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "parameters": {k: v for k, v in vars(args).items() if k != "output"},
+        "cases": cases
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    else:
+        print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,24 @@ from kafka import KafkaProducer
 from datetime import datetime
 
 class EventsProducer:
-    def __init__(self, bootstrap_servers):
+    def __init__(self, bootstrap_servers, linger_ms=5, batch_size=16384, compression_type=None, max_block_ms=60000):
         """
-        Initialize Kafka Producer with bootstrap servers
+        Initialize Kafka Producer with bootstrap servers, meant to be shared by the whole application
         
         :param bootstrap_servers: List of Kafka broker addresses (comma-separated)
+        :param linger_ms: Time to wait for more events before sending a batch
+        :param batch_size: Maximum size in bytes of a batch of events sent to one partition
+        :param compression_type: Optional compression of the batches (gzip, snappy, lz4 or zstd)
+        :param max_block_ms: Maximum time a send may block, e.g. while the topic metadata is fetched
         """
         self.producer = KafkaProducer(
             bootstrap_servers=bootstrap_servers,
             client_id='predictive-maintenance',
             value_serializer=lambda v: json.dumps(v).encode('utf-8'), # Serialize JSON
+            linger_ms=linger_ms,
+            batch_size=batch_size,
+            compression_type=compression_type,
+            max_block_ms=max_block_ms,
         )
 
     def validate_event_data(self, event_data):
@@ -35,12 +43,17 @@ class EventsProducer:
         
         return event_data
 
-    def produce_event(self, topic, event_data):
+    def produce_event(self, topic, event_data, on_success=None, on_error=None):
         """
-        Produce a Kafka event to the specified topic
+        Produce a Kafka event to the specified topic, without waiting for its delivery: the event is batched and
+        sent in the background, and on_success or on_error is called from the producer thread once the broker
+        acknowledged it or the delivery failed
         
         :param topic: Kafka topic to send the event to
         :param event_data: Dictionary containing event details
+        :param on_success: Optional callback called with the RecordMetadata of the delivered event
+        :param on_error: Optional callback called with the exception of a failed delivery
+        :return: Future of the delivery
         """
 
         # Add timestamp if not provided
@@ -56,23 +69,34 @@ class EventsProducer:
         
         try:
             # Produce message to Kafka topic
-            self.producer.send(
+            future = self.producer.send(
                 topic,
                 validated_event
             )
+            if on_success is not None:
+                future.add_callback(on_success)
+            if on_error is not None:
+                future.add_errback(on_error)
             
-            # Flush to ensure message is sent
-            self.producer.flush()
-            
-            return
+            return future
         
         except Exception as e:
             raise RuntimeError(f"Failed to produce event: {str(e)}")
 
-    def close(self):
+    def flush(self, timeout=None):
+        """
+        Wait until the pending events are delivered
+        
+        :param timeout: Maximum time to wait in seconds
+        """
+        self.producer.flush(timeout)
+
+    def close(self, timeout=None):
         """
-        Close the Kafka producer
+        Deliver the pending events and close the Kafka producer
+        
+        :param timeout: Maximum time to wait in seconds
         """
         if self.producer:
-            self.producer.flush()
-            self.producer.close()
\ No newline at end of file
+            self.producer.flush(timeout)
+            self.producer.close(timeout)
\ No newline at end of file
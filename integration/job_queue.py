@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+
+class QueueFullError(Exception):
+    """
+    Raised when a job is submitted while the queue already holds its maximum of pending jobs
+    """
+
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class Job:
+    def __init__(self, description=None, key=None, group=None, limited=True):
+        """
+        State of one queued job, read by the job status endpoint
+
+        :param description: Optional summary of the job request
+        :param key: Optional identity of the request, identical pending requests share one job
+        :param group: Optional group of the request, a new job cancels the pending jobs of its group
+        :param limited: Whether the job waits for one of the limited slots of the queue
+        """
+        self.id = uuid.uuid4().hex
+        self.description = description
+        self.key = key
+        self.group = group
+        self.limited = limited
+        self.status = "queued"
+        self.created = _now()
+        self.started = None
+        self.finished = None
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.task = None
+        # Set when the job is superseded; the run polls it and stops at its next generation
+        self.cancel_event = threading.Event()
+        # Set to accept the best schedule found so far; the run stops at its next generation and completes
+        self.stop_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self, reason):
+        """
+        Cancel the job: a queued job will not start, a running job should stop as soon as it sees cancel_event
+
+        :param reason: Error reported for the job
+        """
+        self.error = reason
+        self.cancel_event.set()
+        if self.status == "queued":
+            self.status = "cancelled"
+            self.finished = _now()
+
+    def update_progress(self, progress):
+        """
+        Record the progress of the optimization, called from the worker thread after every generation
+
+        :param progress: Dict with the generations run so far, the maximum number of generations, the best cost
+            savings found so far, the population diversity and the elapsed time
+        """
+        self.progress = progress
+
+    def stop(self):
+        """
+        Ask a running job to stop early and complete with the best schedule found so far
+        """
+        self.stop_event.set()
+
+    def to_dict(self):
+        return {
+            "jobId": self.id,
+            "status": self.status,
+            "description": self.description,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobQueue:
+    def __init__(self, max_concurrent, max_queued, history=100):
+        """
+        Bounded queue running at most max_concurrent jobs at a time on the event loop
+
+        :param max_concurrent: Number of jobs running at the same time
+        :param max_queued: Number of jobs waiting for a free slot, further submissions are rejected
+        :param history: Number of finished jobs kept for the status endpoint, the oldest ones are forgotten
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.history = history
+        self.jobs = OrderedDict()
+        self._slots = asyncio.Semaphore(max_concurrent)
+
+    def counts(self):
+        """
+        Number of jobs per status
+
+        :return: Dict {status: count} with at least the queued and running statuses
+        """
+        counts = {"queued": 0, "running": 0}
+        for job in self.jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+    def submit(self, run, description=None, key=None, group=None, limited=True):
+        """
+        Queue a job, started as soon as one of the max_concurrent slots is free
+
+        A request with the same key as a queued or running job is coalesced into that job. Otherwise the queued
+        and running jobs of the same group are superseded: they are cancelled and only the new job completes.
+        Jobs that are not limited, e.g. answered from a cache, start right away and are never rejected.
+
+        :param run: Coroutine function called with the Job once it starts; it may set job.result and job.error,
+            an exception marks the job as failed, and it should stop early once job.cancelled is set
+        :param description: Optional summary of the job request
+        :param key: Optional identity of the request
+        :param group: Optional group of the request, e.g. the module it plans
+        :param limited: Whether the job takes one of the max_concurrent slots and counts against max_queued
+        :return: The queued Job, or the pending job with the same key
+        :raises QueueFullError: If max_queued jobs are already waiting
+        """
+        pending = [job for job in self.jobs.values() if job.status in ("queued", "running") and not job.cancelled]
+        if key is not None:
+            for job in pending:
+                if job.key == key:
+                    return job
+        superseded = [job for job in pending if group is not None and job.group == group]
+        if limited and sum(job.status == "queued" and job.limited for job in pending if job not in superseded) >= self.max_queued:
+            raise QueueFullError(f"The job queue is full ({self.max_queued} jobs waiting)")
+        job = Job(description, key, group, limited)
+        for old in superseded:
+            old.cancel(f"Superseded by job {job.id}")
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, run))
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def _run(self, job, run):
+        async with self._slots if job.limited else contextlib.nullcontext():
+            if job.cancelled:
+                # Cancelled while waiting for its slot
+                return
+            job.status = "running"
+            job.started = _now()
+            try:
+                await run(job)
+            except Exception as e:
+                job.error = job.error or str(e)
+            job.status = "cancelled" if job.cancelled else "failed" if job.error else "completed"
+            job.finished = _now()
+        self._forget_finished()
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ("completed", "failed", "cancelled")]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
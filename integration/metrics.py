@@ -0,0 +1,138 @@
+import math
+import threading
+
+
+class Metric:
+    def __init__(self, name, documentation, metric_type, labelnames=(), function=None):
+        """
+        Base of the metrics rendered in the Prometheus text exposition format
+
+        :param name: Metric name
+        :param documentation: Help text of the metric
+        :param metric_type: Prometheus type (counter, gauge or histogram)
+        :param labelnames: Names of the labels, the values are given to inc(), set() or observe()
+        :param function: Optional callable returning the current values at scrape time, as a dict from the tuple
+            of label values to the value, for values kept elsewhere (counter and gauge)
+        """
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = tuple(labelnames)
+        self.function = function
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+    def samples(self):
+        # (suffix, label key, extra labels, value) of every sample of the metric
+        if self.function is not None:
+            return [("", tuple(str(label) for label in key), (), value) for key, value in sorted(self.function().items())]
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{self._format_labels(key, extra)} {format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """
+        Monotonically increasing total, e.g. of requests or failures
+        """
+        super().__init__(name, documentation, "counter", labelnames, function)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        """
+        Value that can go up and down, e.g. the number of running jobs
+        """
+        super().__init__(name, documentation, "gauge", labelnames, function)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """
+        Distribution of observed values, e.g. latencies in seconds, counted in cumulative buckets
+
+        :param buckets: Upper bounds of the buckets, the +Inf bucket is added
+        """
+        super().__init__(name, documentation, "histogram", labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, counts):
+                    samples.append(("_bucket", key, (("le", format_value(bound)),), count))
+                samples.append(("_sum", key, (), total))
+                samples.append(("_count", key, (), counts[-1]))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        Metrics exposed together by the /metrics endpoint
+        """
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """
+        Render every registered metric in the Prometheus text exposition format
+
+        :return: Exposition text, ending with a newline
+        """
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+def format_value(value):
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
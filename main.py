@@ -1,19 +1,24 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from pydantic import BaseModel, Field
-from typing import Dict, List, Any, Union
-from datetime import datetime
+from typing import Dict, List, Any, Union, Optional, Literal
+from datetime import datetime, timezone
 from fastapi.openapi.utils import get_openapi
 import os
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 import base64
+import hashlib
 import json
 import logging
 import sys
+import time
+
+from integration.metrics import MetricsRegistry, Counter, Gauge, Histogram
+from integration.job_queue import JobQueue, QueueFullError
 
 # Configure logging
 logging.basicConfig(
@@ -30,11 +35,13 @@ logger = logging.getLogger(__name__)
 # Import modules with error handling
 try:
     # Import the genetic algorithm and output function from the algorithm module - PdM1
-    from algorithm.algorithm import async_processing_grouping_maintenance_request
+    from algorithm.algorithm import async_processing_grouping_maintenance_request, ResultCache, run_counters
     logger.info("Successfully imported algorithm module")
 except ImportError as e:
     logger.error(f"Failed to import algorithm module: {e}")
     async_processing_grouping_maintenance_request = None
+    ResultCache = None
+    run_counters = None
 
 try:
     # Import EventsProducer for Kafka integration
@@ -61,16 +68,134 @@ except ImportError as e:
 # Create a thread pool executor for parallel processing
 executor = ThreadPoolExecutor()
 
+# Results of completed grouping requests, keyed on the normalized request, so resubmissions skip the algorithm
+result_cache = ResultCache(int(os.getenv("RESULT_CACHE_SIZE", "100")), float(os.getenv("RESULT_CACHE_TTL", "3600"))) if ResultCache else None
+
+# Grouping jobs: at most GROUPING_MAX_CONCURRENT_JOBS run at a time, GROUPING_MAX_QUEUED_JOBS more may wait
+job_queue = JobQueue(int(os.getenv("GROUPING_MAX_CONCURRENT_JOBS", "2")), int(os.getenv("GROUPING_MAX_QUEUED_JOBS", "20")),
+                     history=int(os.getenv("GROUPING_JOB_HISTORY", "100")))
+# Minimum interval in seconds between two progress messages of the job progress stream
+GROUPING_PROGRESS_INTERVAL = float(os.getenv("GROUPING_PROGRESS_INTERVAL", "0.5"))
+
+# Shared Kafka producer, created in the lifespan (or on the first event if the broker was unreachable at startup)
+KAFKA_BROKER = os.getenv("KAFKA_BROKER", "kafka:9092")
+KAFKA_PRODUCER_SETTINGS = {
+    "linger_ms": int(os.getenv("KAFKA_LINGER_MS", "5")),
+    "batch_size": int(os.getenv("KAFKA_BATCH_SIZE", "16384")),
+    "compression_type": os.getenv("KAFKA_COMPRESSION") or None,
+    "max_block_ms": int(os.getenv("KAFKA_MAX_BLOCK_MS", "10000"))
+}
+producer_lock = asyncio.Lock()
+
+# ---- Metrics ----
+metrics = MetricsRegistry()
+HTTP_REQUESTS = metrics.register(Counter(
+    "http_requests_total", "HTTP requests by endpoint and status code", ("method", "endpoint", "status")))
+HTTP_REQUEST_DURATION = metrics.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by endpoint", ("method", "endpoint")))
+EXECUTOR_JOBS = metrics.register(Gauge(
+    "executor_jobs", "Jobs submitted to a thread pool, waiting for a thread (queued) or running", ("executor", "state")))
+EXECUTOR_MAX_WORKERS = metrics.register(Gauge(
+    "executor_max_workers", "Threads of a thread pool", ("executor",),
+    function=lambda: {(name, ): pool._max_workers for name, pool in executors().items()}))
+GROUPING_JOBS = metrics.register(Gauge(
+    "grouping_jobs", "Grouping jobs in the job queue by status", ("status",),
+    function=lambda: {(status, ): count for status, count in job_queue.counts().items()}))
+GROUPING_JOBS_REJECTED = metrics.register(Counter(
+    "grouping_jobs_rejected_total", "Grouping requests rejected because the job queue was full"))
+GROUPING_JOB_DURATION = metrics.register(Histogram(
+    "grouping_job_duration_seconds", "Run time of the grouping maintenance algorithm, excluding queueing"))
+GA_GENERATIONS = metrics.register(Counter(
+    "ga_generations_total", "Generations run by the genetic algorithms",
+    function=lambda: {(): run_counters.generations if run_counters is not None else 0}))
+GA_EVALUATIONS = metrics.register(Counter(
+    "ga_fitness_evaluations_total", "Genomes evaluated by the genetic algorithms",
+    function=lambda: {(): run_counters.evaluations if run_counters is not None else 0}))
+KAFKA_PUBLISH_DURATION = metrics.register(Histogram(
+    "kafka_publish_duration_seconds", "Latency of publishing an event to Kafka, from the send to the broker acknowledgement", ("topic",)))
+KAFKA_PUBLISH_FAILURES = metrics.register(Counter(
+    "kafka_publish_failures_total", "Events that could not be published to Kafka", ("topic",)))
+PDM2_DURATION = metrics.register(Histogram(
+    "pdm2_processing_duration_seconds", "Run time of the threshold-based maintenance analysis, excluding queueing"))
+
+# Thread pools whose saturation is exposed in the metrics
+def executors():
+    pools = {"grouping": executor}
+    if getattr(app.state, "executor", None) is not None:
+        pools["pdm2"] = app.state.executor
+    return pools
+
+# Run function in a thread pool, counted as queued until a thread picks it up and then as running
+async def run_in_tracked_executor(pool, name, function, duration=None):
+    started = False
+    EXECUTOR_JOBS.inc(executor=name, state="queued")
+
+    def job():
+        nonlocal started
+        started = True
+        EXECUTOR_JOBS.dec(executor=name, state="queued")
+        EXECUTOR_JOBS.inc(executor=name, state="running")
+        start = time.perf_counter()
+        try:
+            return function()
+        finally:
+            EXECUTOR_JOBS.dec(executor=name, state="running")
+            if duration is not None:
+                duration.observe(time.perf_counter() - start)
+
+    try:
+        return await asyncio.get_event_loop().run_in_executor(pool, job)
+    finally:
+        if not started:
+            EXECUTOR_JOBS.dec(executor=name, state="queued")
+
+# Shared Kafka producer, connected in a worker thread the first time it is needed
+async def events_producer():
+    async with producer_lock:
+        if getattr(app.state, "events_producer", None) is None:
+            app.state.events_producer = await asyncio.to_thread(EventsProducer, KAFKA_BROKER, **KAFKA_PRODUCER_SETTINGS)
+            logger.info(f"Kafka producer connected to {KAFKA_BROKER}")
+    return app.state.events_producer
+
+# Publish one event with the shared producer without waiting for its delivery; the publish latency and the
+# failed deliveries are recorded by the delivery callbacks, from the producer thread. The send itself runs in a
+# worker thread, since it blocks while the topic metadata is fetched or the producer buffer is full
+async def publish_event(topic, event_data):
+    start = time.perf_counter()
+
+    def delivered(metadata):
+        KAFKA_PUBLISH_DURATION.observe(time.perf_counter() - start, topic=topic)
+
+    def failed(error):
+        KAFKA_PUBLISH_FAILURES.inc(topic=topic)
+        logger.error(f"Failed to deliver event to Kafka topic {topic}: {error}")
+
+    try:
+        producer = await events_producer()
+        await asyncio.to_thread(producer.produce_event, topic, event_data, on_success=delivered, on_error=failed)
+    except Exception:
+        KAFKA_PUBLISH_FAILURES.inc(topic=topic)
+        raise
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting up FastAPI application...")
     app.state.executor = ThreadPoolExecutor(max_workers=5)
+    app.state.events_producer = None
+    if EventsProducer is not None:
+        try:
+            await events_producer()
+        except Exception as e:
+            logger.warning(f"Kafka producer not connected at startup, retrying on the first event: {e}")
     logger.info("Application startup complete")
     yield
     # Shutdown
     logger.info("Shutting down FastAPI application...")
     app.state.executor.shutdown()
+    if app.state.events_producer is not None:
+        # Deliver the events still batched before closing the connection
+        await asyncio.to_thread(app.state.events_producer.close, float(os.getenv("KAFKA_CLOSE_TIMEOUT", "10")))
     logger.info("Application shutdown complete")
 
 app = FastAPI(
@@ -156,6 +281,21 @@ async def log_requests(request: Request, call_next):
     logger.info(f"Response status code: {response.status_code}")
     return response
 
+# Record the count and latency of requests per route template, so path parameters do not create new series
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        HTTP_REQUESTS.inc(method=request.method, endpoint=endpoint, status=status)
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, method=request.method, endpoint=endpoint)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=get_cors_origins(),
@@ -196,6 +336,20 @@ class ComponentData(BaseModel):
     
     model_config = {"populate_by_name": True}
 
+class GroupingOptions(BaseModel):
+    solver: Optional[Literal["genetic", "island", "dp", "exact"]] = Field(None, description="Optimizer used for the grouping: single-population ('genetic') or island-model ('island') genetic algorithm, exact dynamic programming over time-contiguous groups ('dp') or branch and bound over all groupings ('exact', at most 12 activities). By default 'exact' for at most 12 activities, 'genetic' otherwise")
+    islands: Optional[int] = Field(None, gt=0, description="Number of sub-populations for the island solver")
+    migrationInterval: Optional[int] = Field(None, gt=0, description="Generations between two migrations for the island solver")
+    migrants: Optional[int] = Field(None, gt=0, description="Best genomes sent to the next island at each migration")
+    maxGenerations: Optional[int] = Field(None, gt=0, description="Maximum number of generations (default: 700)")
+    timeLimit: Optional[float] = Field(None, gt=0, description="Wall-clock budget of the optimization in seconds; the best solution found so far is returned")
+    stagnationGenerations: Optional[int] = Field(None, gt=0, description="Stop when the best cost savings did not improve for this many generations")
+    targetFitness: Optional[float] = Field(None, description="Stop as soon as the cost savings reach this value")
+    maxGroupSize: Optional[int] = Field(None, gt=0, description="Largest group considered by the dp solver (default: 64)")
+    localSearch: bool = Field(False, description="Refine the best genomes by hill climbing every 25 generations and the final schedule at the end (genetic and island solvers)")
+    warmStart: bool = Field(True, description="Seed part of the initial population with the last schedule stored for the module (requires GA_SOLUTION_STORE)")
+    profile: bool = Field(False, description="Time the stages of the run (decode, mappings, makespan, penalty, evaluation, selection, crossover, mutation, local search) and add their calls, total, p50 and p99 times to the results as 'Profile'")
+
 class GroupingMaintenanceInput(BaseModel):
     setupCost: float = Field(..., gt=0, description="Setup cost for maintenance operations")
     downtimeCostRate: float = Field(..., gt=0, description="Cost rate of downtime during maintenance")
@@ -205,6 +359,7 @@ class GroupingMaintenanceInput(BaseModel):
     components: List[ComponentData] = Field(..., description="List of components with their maintenance data")
     timeWindowStart: str = Field(..., description="Time window start in ISO format (e.g., '2025-09-01T00:00:00')")
     timeWindowEnd: str = Field(..., description="Time window end in ISO format (e.g., '2025-09-30T00:00:00')")
+    options: Optional[GroupingOptions] = Field(None, description="Optional solver settings")
 
 class FailureEvent(BaseModel):
     Stage: str = Field(..., description="Stage name")
@@ -278,6 +433,63 @@ class Base64Response(BaseModel):
     """Unified response model for Base64 encoded results"""
     response: str = Field(..., description="Base64 encoded JSON result")                            
                                 
+# Content address of a grouping request: every input of the algorithm, normalized after parsing
+# (datetimes in ISO format, numbers as validated floats), but not the module and smart service identifiers
+def grouping_request_key(setup_cost, downtime_cost_rate, no_repairmen, component_list, TW_start, TW_end, options):
+    normalized = {
+        "setupCost": setup_cost,
+        "downtimeCostRate": downtime_cost_rate,
+        "noRepairmen": no_repairmen,
+        "components": component_list,
+        "timeWindowStart": TW_start.isoformat(),
+        "timeWindowEnd": TW_end.isoformat(),
+        "options": options.model_dump(exclude_none=True) if options else None
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True, default=lambda value: value.isoformat()).encode("utf-8")).hexdigest()
+
+# Parse the time window and the Last Maintenance Action Time of the components of a grouping request,
+# raising ValueError for invalid datetimes
+def parse_grouping_request(components, time_window_start, time_window_end):
+    # Parse datetime strings to datetime objects
+    try:
+        TW_start = datetime.fromisoformat(time_window_start.replace('Z', '+00:00'))
+        TW_end = datetime.fromisoformat(time_window_end.replace('Z', '+00:00'))
+        logger.info(f"Parsed time window: {TW_start} to {TW_end}")
+    except ValueError as e:
+        logger.error(f"Invalid datetime format: {str(e)}")
+        raise ValueError(f"Invalid datetime format. Use ISO format like '2025-09-01T00:00:00': {str(e)}")
+    
+    # Convert ComponentData objects to simple list for the algorithm
+    component_list = [component.model_dump(by_alias=True) for component in components]
+    
+    # Parse Last Maintenance Action Time strings to datetime objects for each component
+    for comp in component_list:
+        if "Last Maintenance Action Time" in comp:
+            try:
+                comp["Last Maintenance Action Time"] = datetime.fromisoformat(
+                    comp["Last Maintenance Action Time"].replace('Z', '+00:00')
+                )
+            except ValueError as e:
+                logger.error(f"Invalid datetime format in component {comp.get('Module ID', 'unknown')}: {str(e)}")
+                raise ValueError(f"Invalid datetime format in component data: {str(e)}")
+    
+    # Log component structure after model_dump for debugging
+    if component_list:
+        logger.info(f"First component keys after model_dump: {list(component_list[0].keys())}")
+        logger.debug(f"First component data: {component_list[0]}")
+    return component_list, TW_start, TW_end
+
+# Result of an identical earlier request still in the result cache, None if there is none or the request is invalid
+def cached_grouping_result(data):
+    if result_cache is None:
+        return None
+    try:
+        component_list, TW_start, TW_end = parse_grouping_request(data.components, data.timeWindowStart, data.timeWindowEnd)
+    except ValueError:
+        return None
+    return result_cache.get(grouping_request_key(data.setupCost, data.downtimeCostRate, data.noRepairmen, component_list,
+                                                 TW_start, TW_end, data.options))
+
 # Async function to process grouping maintenance and publish to Kafka
 async def process_grouping_maintenance_async(
     setup_cost: float,
@@ -287,80 +499,80 @@ async def process_grouping_maintenance_async(
     smart_service: str,
     module: str,
     time_window_start: str,
-    time_window_end: str):
+    time_window_end: str,
+    options: Optional[GroupingOptions] = None,
+    job=None,
+    cached_event=None):
     """
     Process grouping maintenance request asynchronously and publish results to Kafka.
+    When run from the job queue, the progress, results and error are also recorded on job.
+    cached_event is the event of an identical earlier request, published again instead of running the algorithm.
     """
     try:
-        # Parse datetime strings to datetime objects
-        from datetime import datetime
-        try:
-            TW_start = datetime.fromisoformat(time_window_start.replace('Z', '+00:00'))
-            TW_end = datetime.fromisoformat(time_window_end.replace('Z', '+00:00'))
-            logger.info(f"Parsed time window: {TW_start} to {TW_end}")
-        except ValueError as e:
-            logger.error(f"Invalid datetime format: {str(e)}")
-            raise ValueError(f"Invalid datetime format. Use ISO format like '2025-09-01T00:00:00': {str(e)}")
+        component_list, TW_start, TW_end = parse_grouping_request(components, time_window_start, time_window_end)
         
-        # Convert ComponentData objects to simple list for the algorithm
-        component_list = [component.model_dump(by_alias=True) for component in components]
-        
-        # Parse Last Maintenance Action Time strings to datetime objects for each component
-        for comp in component_list:
-            if "Last Maintenance Action Time" in comp:
-                try:
-                    comp["Last Maintenance Action Time"] = datetime.fromisoformat(
-                        comp["Last Maintenance Action Time"].replace('Z', '+00:00')
-                    )
-                except ValueError as e:
-                    logger.error(f"Invalid datetime format in component {comp.get('Module ID', 'unknown')}: {str(e)}")
-                    raise ValueError(f"Invalid datetime format in component data: {str(e)}")
-        
-        # Log component structure after model_dump for debugging
-        if component_list:
-            logger.info(f"First component keys after model_dump: {list(component_list[0].keys())}")
-            logger.debug(f"First component data: {component_list[0]}")
-        
-        # Run the CPU-intensive algorithm in thread pool
-        loop = asyncio.get_event_loop()
-        event_data = await loop.run_in_executor(
-            None,  # Use default thread pool
-            partial(
-                async_processing_grouping_maintenance_request,
-                setup_cost,
-                downtime_cost_rate,
-                no_repairmen,
-                component_list,
-                smart_service,
-                module,
-                TW_start,
-                TW_end
+        # Identical requests reuse the result of the last completed run
+        request_key = grouping_request_key(setup_cost, downtime_cost_rate, no_repairmen, component_list, TW_start, TW_end, options)
+        if cached_event is not None:
+            logger.info(f"Publishing cached grouping maintenance result for module: {module}")
+            event_data = dict(
+                cached_event,
+                description="The grouping maintenance optimization has been successfully completed for the production module '{}'.".format(module),
+                module=module,
+                smartService=smart_service,
+                timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
             )
-        )
-        
-        # Get Kafka broker from environment variable and publish event
-        kafka_broker = os.getenv("KAFKA_BROKER", "kafka:9092")
-        producer = EventsProducer(kafka_broker)
+        else:
+            # Run the CPU-intensive algorithm in thread pool
+            event_data = await run_in_tracked_executor(
+                executor,
+                "grouping",
+                partial(
+                    async_processing_grouping_maintenance_request,
+                    setup_cost,
+                    downtime_cost_rate,
+                    no_repairmen,
+                    component_list,
+                    smart_service,
+                    module,
+                    TW_start,
+                    TW_end,
+                    options.model_dump(exclude_none=True) if options else None,
+                    progress=job.update_progress if job is not None else None,
+                    cancel=job.cancel_event if job is not None else None,
+                    stop=job.stop_event if job is not None else None
+                ),
+                duration=GROUPING_JOB_DURATION
+            )
+            if job is not None and job.cancelled:
+                # A newer request for the same module and smart service replaced this one, only its schedule is published
+                logger.info(f"Grouping maintenance job {job.id} for module {module} was superseded, its result is not published")
+                return
+            # A run stopped early from the progress stream is published, but not reused for identical requests
+            stopped = (event_data.get("results") or {}).get("Stopping reason") == "stopped"
+            if result_cache is not None and event_data.get("results") is not None and not stopped:
+                result_cache.put(request_key, event_data)
+        if job is not None:
+            job.result = event_data.get("results")
+            job.error = event_data["description"] if job.result is None else None
         
         # Publish event (success or error) to Kafka topic
-        producer.produce_event("grouping-predictive-maintenance", event_data)
+        await publish_event("grouping-predictive-maintenance", event_data)
         
         # Log appropriate message based on event type
         if 'Error' in event_data.get('eventType', ''):
-            print("Error event regarding grouping maintenance published successfully!")
+            print("Error event regarding grouping maintenance sent for publishing!")
         else:
-            print("Event regarding grouping maintenance published successfully!")
-        
-        producer.close()
+            print("Event regarding grouping maintenance sent for publishing!")
         
     except Exception as e:
         print(f"Critical error in async grouping maintenance processing: {str(e)}")
+        # A failed publication leaves the results of a finished run available on the job
+        if job is not None and job.result is None:
+            job.error = job.error or str(e)
         
         # Last resort: create and publish a critical error event
         try:
-            kafka_broker = os.getenv("KAFKA_BROKER", "kafka.modapto.atc.gr:9092")
-            producer = EventsProducer(kafka_broker)
-            
             critical_error_event = {
                 "description": f"Critical error in maintenance API processing: {str(e)}",
                 "module": module,
@@ -373,8 +585,7 @@ async def process_grouping_maintenance_async(
                 "results": None
             }
             
-            producer.produce_event("grouping-predictive-maintenance", critical_error_event)
-            producer.close()
+            await publish_event("grouping-predictive-maintenance", critical_error_event)
             print("Critical error event published to Kafka!")
         except Exception as kafka_error:
             print(f"Failed to publish critical error event to Kafka: {str(kafka_error)}")
@@ -459,13 +670,14 @@ async def predict_threshold_based_maintenance(base64_data: Base64Request):
             raise HTTPException(status_code=422, detail=f"Request validation failed: {str(e)}")
         
         # Use ThreadPoolExecutor for CPU-bound tasks
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
+        result = await run_in_tracked_executor(
             app.state.executor,
+            "pdm2",
             partial(
                 process_threshold_maintenance_request,
                 data
-            )
+            ),
+            duration=PDM2_DURATION
         )
         logger.info(f"Raw result from PdM2Service: {json.dumps(result, indent=2, default=str)}")
         # Validate Result
@@ -554,20 +766,38 @@ async def predict_grouping_maintenance(base64_data: Base64Request):
             
             raise HTTPException(status_code=422, detail=f"Request validation failed: {str(e)}")
             
-        # Start the async algorithm processing (fire and forget)
-        asyncio.create_task(process_grouping_maintenance_async(
-            data.setupCost,
-            data.downtimeCostRate,
-            data.noRepairmen,
-            data.components,
-            data.smartServiceId,
-            data.moduleId,
-            data.timeWindowStart,
-            data.timeWindowEnd
-        ))
+        # Queue the async algorithm processing, results are published to Kafka and kept on the job.
+        # An identical request still in progress is answered with its job, and a different request for the same
+        # module and smart service cancels the previous one, so only the latest schedule is published.
+        # A request whose result is cached is published right away, without waiting for a free slot
+        cached_event = cached_grouping_result(data)
+        try:
+            job = job_queue.submit(
+                partial(
+                    process_grouping_maintenance_async,
+                    data.setupCost,
+                    data.downtimeCostRate,
+                    data.noRepairmen,
+                    data.components,
+                    data.smartServiceId,
+                    data.moduleId,
+                    data.timeWindowStart,
+                    data.timeWindowEnd,
+                    data.options,
+                    cached_event=cached_event
+                ),
+                description={"module": data.moduleId, "smartService": data.smartServiceId},
+                key=hashlib.sha256(data.model_dump_json().encode("utf-8")).hexdigest(),
+                group=(data.moduleId, data.smartServiceId),
+                limited=cached_event is None
+            )
+        except QueueFullError as e:
+            GROUPING_JOBS_REJECTED.inc()
+            logger.warning(f"Rejecting grouping maintenance request: {str(e)}")
+            raise HTTPException(status_code=429, detail=f"{str(e)}, retry later")
         
-        logger.info("Successfully initialized grouping maintenance algorithm")
-        return {"message": "Grouping maintenance algorithm has been successfully initialized"}
+        logger.info(f"Successfully initialized grouping maintenance algorithm as job {job.id}")
+        return {"message": "Grouping maintenance algorithm has been successfully initialized", "jobId": job.id}
     except HTTPException:
         # Re-raise HTTP exceptions (400, 503)
         raise
@@ -575,6 +805,55 @@ async def predict_grouping_maintenance(base64_data: Base64Request):
         logger.error(f"Error in grouping maintenance: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error while initializing the grouping maintenance algorithm: {str(e)}")
 
+@app.get("/jobs/{job_id}", tags=["Grouping Predictive Maintenance (PdM1)"])
+def get_job(job_id: str):
+    """
+    Status of a grouping maintenance job: queued, running, completed or failed, with the progress of the
+    optimization while it runs and the results (as published to Kafka) or the error once it is finished.
+    Finished jobs are kept for a limited number of newer jobs.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+    return job.to_dict()
+
+@app.websocket("/jobs/{job_id}/progress")
+async def stream_job_progress(websocket: WebSocket, job_id: str):
+    """
+    Stream the progress of a grouping maintenance job while it is queued or running, at most one message every
+    GROUPING_PROGRESS_INTERVAL seconds: {"type": "progress", "jobId", "status", "generations", "maxGenerations",
+    "bestFitness", "diversity", "elapsedTime"}. Once the job is finished, a last {"type": "result", ...} message
+    with the job status, results and error is sent and the connection is closed.
+    Sending {"action": "stop"} stops the optimization at its next generation and completes the job with the best
+    schedule found so far (stopping reason "stopped").
+    """
+    await websocket.accept()
+    job = job_queue.get(job_id)
+    if job is None:
+        await websocket.close(code=1008, reason=f"Unknown job '{job_id}'")
+        return
+    try:
+        sent = None
+        while job.status in ("queued", "running"):
+            progress = job.progress
+            if progress is not None and progress is not sent:
+                await websocket.send_json({"type": "progress", "jobId": job.id, "status": job.status, **progress})
+                sent = progress
+            try:
+                message = await asyncio.wait_for(websocket.receive_json(), timeout=GROUPING_PROGRESS_INTERVAL)
+            except asyncio.TimeoutError:
+                continue
+            except ValueError:
+                # Not JSON, ignored
+                continue
+            if isinstance(message, dict) and message.get("action") == "stop":
+                logger.info(f"Grouping maintenance job {job.id} stopped early from the progress stream")
+                job.stop()
+        await websocket.send_json({"type": "result", **job.to_dict()})
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.debug(f"Progress stream of job {job_id} disconnected")
+
 @app.get("/health" , tags=["Health Check"])
 def health_check():
     """
@@ -593,3 +872,10 @@ def health_check():
         "services": services_status,
         "message": "Predictive Maintenance API is running"
     }
+
+@app.get("/metrics", tags=["Health Check"])
+def get_metrics():
+    """
+    Metrics of the API in the Prometheus text exposition format.
+    """
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,53 @@
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithm import algorithm  # noqa: E402
+
+TW_START = datetime(2025, 9, 1)
+TW_END = datetime(2025, 9, 30)
+GENERATIONS = 100000
+
+
+def component_list(size, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "Module ID": str(i),
+            "Module": f"MODULE {i}",
+            "Alpha": rng.choice([1, 5, 10]),
+            "Beta": rng.uniform(3.0, 20.0),
+            "Average maintenance duration": round(rng.uniform(0.3, 15.0), 3),
+            "MTBF": round(rng.uniform(50.0, 1500.0), 3),
+            "Last Maintenance Action Time": TW_START - timedelta(days=rng.uniform(0.0, 30.0))
+        }
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("event, reason", [("stop", "stopped"), ("cancel", "cancelled")])
+def test_event_interrupts_island_epoch(event, reason):
+    # A single migration epoch covers the whole run, so only the islands themselves can end it early
+    signal = threading.Event()
+    stopping = algorithm.StoppingCriteria(max_generations=GENERATIONS, **{event: signal})
+    timer = threading.Timer(2.0, signal.set)
+    timer.start()
+    start = time.time()
+    try:
+        best_solution, _, island_statistics = algorithm.island_genetic_algorithm(
+            500, 100, 2, component_list(40), TW_START, TW_END, islands=2, migration_interval=GENERATIONS,
+            generations=GENERATIONS, stopping=stopping)
+    finally:
+        timer.cancel()
+
+    assert stopping.reason == reason
+    assert best_solution
+    assert all(0 < island["Generations"] < GENERATIONS for island in island_statistics)
+    assert time.time() - start < 60